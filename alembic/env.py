@@ -19,9 +19,19 @@ if config.config_file_name is not None:
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
 from app.models.base import Base
-from app.models import user , blog , faq , contacts
+from app.models import user , blog , faq , contacts , stats
 target_metadata = Base.metadata
 
+# Migrate the database the app is configured for (DATABASE_URL / .env)
+from app.core.config import get_settings
+config.set_main_option("sqlalchemy.url", get_settings().database_url.replace("%", "%%"))
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # The SQLite FTS5 search table and its shadow tables come from DDL in
+    # app/models/contacts.py, not from mapped models; never autogenerate drops
+    return not (type_ == "table" and reflected and name.startswith("contact_messages_fts"))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -44,6 +54,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -67,7 +78,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
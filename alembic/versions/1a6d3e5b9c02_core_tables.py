@@ -0,0 +1,87 @@
+"""core tables
+
+Revision ID: 1a6d3e5b9c02
+Revises: ca2a7ff16a71
+Create Date: 2026-10-18 17:12:05.530871
+
+users, revoked_tokens, blogs and faqs used to be created by
+`Base.metadata.create_all` at app import. Existing databases already have
+them, so each table is only created when missing.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a6d3e5b9c02'
+down_revision: Union[str, Sequence[str], None] = 'ca2a7ff16a71'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in existing:
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(), nullable=True),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+        op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+        op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+
+    if 'revoked_tokens' not in existing:
+        op.create_table('revoked_tokens',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('jti', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('token_type', sa.String(length=20), nullable=False),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_revoked_tokens_jti'), 'revoked_tokens', ['jti'], unique=True)
+        op.create_index(op.f('ix_revoked_tokens_user_id'), 'revoked_tokens', ['user_id'], unique=False)
+        op.create_index('ix_revoked_tokens_user_jti', 'revoked_tokens', ['user_id', 'jti'], unique=True)
+
+    if 'blogs' not in existing:
+        op.create_table('blogs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('image', sa.String(length=255), nullable=True),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_blogs_id'), 'blogs', ['id'], unique=False)
+        op.create_index(op.f('ix_blogs_title'), 'blogs', ['title'], unique=True)
+
+    if 'faqs' not in existing:
+        op.create_table('faqs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('question', sa.String(), nullable=True),
+        sa.Column('answer', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_faqs_id'), 'faqs', ['id'], unique=False)
+        op.create_index(op.f('ix_faqs_question'), 'faqs', ['question'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Tables that predate this revision are dropped too; downgrade past it
+    # only on a database Alembic built from scratch.
+    op.drop_table('faqs')
+    op.drop_table('blogs')
+    op.drop_table('revoked_tokens')
+    op.drop_table('users')
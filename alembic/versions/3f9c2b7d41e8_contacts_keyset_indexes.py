@@ -0,0 +1,30 @@
+"""contacts keyset indexes
+
+Revision ID: 3f9c2b7d41e8
+Revises: 1a6d3e5b9c02
+Create Date: 2026-10-18 09:12:40.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2b7d41e8'
+down_revision: Union[str, Sequence[str], None] = '1a6d3e5b9c02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_contact_messages_created_at_id', 'contact_messages', ['created_at', 'id'], unique=False)
+    op.create_index('ix_contact_messages_status_created_at_id', 'contact_messages', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_contact_messages_status_created_at_id', table_name='contact_messages')
+    op.drop_index('ix_contact_messages_created_at_id', table_name='contact_messages')
@@ -0,0 +1,44 @@
+"""stats counters
+
+Revision ID: 5e2f8a9c7b14
+Revises: d4a7c9e1f305
+Create Date: 2026-10-18 15:02:37.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e2f8a9c7b14'
+down_revision: Union[str, Sequence[str], None] = 'd4a7c9e1f305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'stats_counters',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('users', sa.BigInteger(), nullable=False),
+        sa.Column('blogs', sa.BigInteger(), nullable=False),
+        sa.Column('messages', sa.BigInteger(), nullable=False),
+        sa.Column('new_messages', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Seed the single row with the current exact totals
+    op.execute(
+        "INSERT INTO stats_counters (id, users, blogs, messages, new_messages) SELECT 1, "
+        "(SELECT count(*) FROM users), "
+        "(SELECT count(*) FROM blogs), "
+        "(SELECT count(*) FROM contact_messages), "
+        "(SELECT count(*) FROM contact_messages WHERE status = 'new')"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stats_counters')
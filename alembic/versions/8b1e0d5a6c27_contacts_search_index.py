@@ -0,0 +1,66 @@
+"""contacts search index
+
+Revision ID: 8b1e0d5a6c27
+Revises: 3f9c2b7d41e8
+Create Date: 2026-10-18 11:03:17.552019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e0d5a6c27'
+down_revision: Union[str, Sequence[str], None] = '3f9c2b7d41e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_contact_messages_search_trgm ON contact_messages "
+            "USING gin (name gin_trgm_ops, email gin_trgm_ops, phone gin_trgm_ops, service gin_trgm_ops)"
+        )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE contact_messages_fts USING fts5("
+            "name, email, phone, service, content='contact_messages', content_rowid='id', tokenize='trigram')"
+        )
+        op.execute(
+            "CREATE TRIGGER contact_messages_fts_ai AFTER INSERT ON contact_messages BEGIN "
+            "INSERT INTO contact_messages_fts(rowid, name, email, phone, service) "
+            "VALUES (new.id, new.name, new.email, new.phone, new.service); END"
+        )
+        op.execute(
+            "CREATE TRIGGER contact_messages_fts_ad AFTER DELETE ON contact_messages BEGIN "
+            "INSERT INTO contact_messages_fts(contact_messages_fts, rowid, name, email, phone, service) "
+            "VALUES ('delete', old.id, old.name, old.email, old.phone, old.service); END"
+        )
+        op.execute(
+            "CREATE TRIGGER contact_messages_fts_au AFTER UPDATE OF name, email, phone, service "
+            "ON contact_messages BEGIN "
+            "INSERT INTO contact_messages_fts(contact_messages_fts, rowid, name, email, phone, service) "
+            "VALUES ('delete', old.id, old.name, old.email, old.phone, old.service); "
+            "INSERT INTO contact_messages_fts(rowid, name, email, phone, service) "
+            "VALUES (new.id, new.name, new.email, new.phone, new.service); END"
+        )
+        # Index rows that existed before the triggers
+        op.execute("INSERT INTO contact_messages_fts(contact_messages_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_contact_messages_search_trgm")
+    elif dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS contact_messages_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS contact_messages_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS contact_messages_fts_ai")
+        op.execute("DROP TABLE IF EXISTS contact_messages_fts")
@@ -0,0 +1,30 @@
+"""contact reference
+
+Revision ID: 9c4e1b7a2d60
+Revises: 5e2f8a9c7b14
+Create Date: 2026-10-18 17:41:09.502713
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1b7a2d60'
+down_revision: Union[str, Sequence[str], None] = '5e2f8a9c7b14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contact_messages', sa.Column('reference', sa.String(length=32), nullable=True))
+    op.create_index(op.f('ix_contact_messages_reference'), 'contact_messages', ['reference'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_contact_messages_reference'), table_name='contact_messages')
+    op.drop_column('contact_messages', 'reference')
@@ -0,0 +1,29 @@
+"""revoked_tokens revoked_at index
+
+Revision ID: b7d2e4f6a813
+Revises: 9c4e1b7a2d60
+Create Date: 2026-10-18 19:12:44.208511
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e4f6a813'
+down_revision: Union[str, Sequence[str], None] = '9c4e1b7a2d60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The revocation cache's periodic sync reads a recent revoked_at window
+    op.create_index(op.f('ix_revoked_tokens_revoked_at'), 'revoked_tokens', ['revoked_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_revoked_tokens_revoked_at'), table_name='revoked_tokens')
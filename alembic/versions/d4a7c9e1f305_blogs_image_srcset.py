@@ -0,0 +1,28 @@
+"""blogs image srcset
+
+Revision ID: d4a7c9e1f305
+Revises: 8b1e0d5a6c27
+Create Date: 2026-10-18 13:26:51.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a7c9e1f305'
+down_revision: Union[str, Sequence[str], None] = '8b1e0d5a6c27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('blogs', sa.Column('image_srcset', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('blogs', 'image_srcset')
@@ -1,5 +1,7 @@
 # app/core/config.py
 from functools import lru_cache
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
@@ -10,6 +12,119 @@ class Settings(BaseSettings):
     secret_key: str
     algorithm: str
 
+    # Database driver mode. True -> async engine (asyncpg / aiosqlite),
+    # False -> the classic sync engine with each DB call run on the threadpool.
+    db_async: bool = True
+    # Optional explicit async URL; derived from database_url when unset.
+    async_database_url: Optional[str] = None
+
+    # Connection pool, per engine and per worker process: the database sees up
+    # to workers * (size + overflow) connections. Recycle is in seconds (-1 =
+    # never); pre-ping tests each connection on checkout. The statement cache
+    # holds compiled SQL per engine.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 500
+
+    # JWT library ("python-jose", or "pyjwt" to opt in), and how many
+    # verified access tokens keep their decoded claims in memory (0 disables;
+    # entries never outlive the token's exp, and revocation is still checked
+    # per request)
+    jwt_backend: str = "python-jose"
+    jwt_claims_cache_size: int = 4096
+
+    # Authenticated user's identity, cached per process (0 disables). Changes
+    # made by this process apply at once; other workers within the TTL.
+    identity_cache_ttl_seconds: float = 30.0
+    identity_cache_max_size: int = 10_000
+
+    # Revoked-token cache: optional Bloom filter in front of the jti set, and
+    # how often to pull revocations made by other workers (0 disables), and
+    # how far before the previous pull each one looks back (commit latency
+    # plus clock skew between workers)
+    revocation_bloom: bool = False
+    revocation_sync_seconds: float = 5.0
+    revocation_sync_slack_seconds: float = 60.0
+
+    # Background sweep of expired revoked_tokens rows (0 disables the task;
+    # cron deployments run `python -m app.core.token_sweeper` instead).
+    token_sweep_interval_seconds: float = 300.0
+    token_sweep_batch_size: int = 1000
+
+    # bcrypt worker pool: jobs beyond workers + max_queue get a 503.
+    # Processes sidestep the GIL entirely at the cost of a fork per worker.
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 16
+    password_hash_processes: bool = False
+
+    # Serialized-response cache for public FAQ/blog reads (TTL 0 disables)
+    response_cache_max_bytes: int = 16 * 1024 * 1024
+    response_cache_ttl_seconds: float = 60.0
+
+    # Where uploaded images are stored (main.py mounts it at /static/images), and
+    # the largest accepted upload, enforced while streaming
+    upload_dir: str = "static/images"
+    upload_max_bytes: int = 5 * 1024 * 1024
+
+    # Worker processes generating resized / WebP variants of blog images
+    image_workers: int = 1
+
+    # Cache-Control max-age for /static files without a content hash in the name
+    static_max_age: int = 3600
+
+    # POST /contacts/bulk: rows per INSERT batch (each batch commits), and
+    # how many per-row errors the response lists (the rest are only counted),
+    # and the most characters one record may span before it is reported
+    contact_import_batch_size: int = 500
+    contact_import_max_errors: int = 100
+    contact_import_max_record_length: int = 64 * 1024
+    # GET /contacts/export: rows fetched per server-side cursor batch
+    contact_export_batch_size: int = 1000
+
+    # Write-behind contact form: POST /contacts/create answers 202 and queues
+    # the row; a background task commits up to BATCH rows at least every
+    # INTERVAL ms. A full queue makes posts wait up to PUT_TIMEOUT, then 503.
+    contact_write_behind: bool = False
+    contact_queue_max_size: int = 10_000
+    contact_queue_batch_size: int = 500
+    contact_queue_interval_ms: int = 200
+    contact_queue_put_timeout_seconds: float = 1.0
+
+    # Admission control: token buckets per client IP and route ({} disables;
+    # rates are "N/second|minute|hour", bursting up to N), where they live
+    # ("memory" per worker, or "package.module:factory" for a shared
+    # backend), and requests in flight per worker before shedding (0 = no cap)
+    rate_limits: Dict[str, str] = {
+        "POST /users/login": "10/minute",
+        "POST /users/register": "5/minute",
+        "POST /contacts/create": "10/minute",
+    }
+    rate_limit_backend: str = "memory"
+    rate_limit_max_keys: int = 100_000
+    max_concurrent_requests: int = 256
+
+    # Exact recount of the dashboard stats counters (0 disables the task;
+    # cron deployments run `python -m app.core.stats_counters` instead)
+    stats_reconcile_interval_seconds: float = 3600.0
+
+    # Dashboard results are shared by all admins for this long (0 disables);
+    # past it they may still be served for STALE seconds while one refresh runs
+    dashboard_cache_ttl_seconds: float = 5.0
+    dashboard_cache_stale_seconds: float = 0.0
+
+    # Per-request SQL profile in a Server-Timing header plus N+1 warnings
+    # (unset -> follows DEBUG); warn when one statement repeats this often
+    sql_profile: Optional[bool] = None
+    sql_profile_repeat_threshold: int = 3
+
+    # Error reporting; Sentry is only initialized when a DSN is set
+    sentry_dsn: Optional[str] = None
+    sentry_environment: Optional[str] = None
+    sentry_traces_sample_rate: float = 0.0
+
     # v2-style config
     model_config = SettingsConfigDict(
         env_file=".env",
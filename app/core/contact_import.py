@@ -0,0 +1,232 @@
+# app/core/contact_import.py
+"""
+Bulk contact ingestion for POST /contacts/bulk.
+
+The request body is read as a stream of NDJSON objects or CSV records (with
+a header row), so an import of any size is never held in memory at once.
+Every record goes through `ContactCreate`, the same validation as the public
+form, honeypot included. Valid rows are inserted `batch_size` at a time as
+one executemany per batch and committed with their counter bump; a bad row
+is reported with its line number and does not stop the rest.
+"""
+import codecs
+import csv
+import json
+import uuid
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+
+from app.core.stats_counters import bump_counters
+from app.models.contacts import ContactMessage, ContactStatus
+from app.schemas.contacts import ContactCreate
+
+# Media types accepted by the bulk endpoint
+FORMATS = {
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json-seq": "ndjson",
+    "text/csv": "csv",
+}
+
+# (line number, parsed record or None, parse error or None)
+Record = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def contact_values(payload: ContactCreate) -> Dict[str, Any]:
+    """Column values for a new message from a validated form payload."""
+    return {
+        "reference": uuid.uuid4().hex,
+        "name": payload.name.strip(),
+        "email": payload.email,
+        "phone": payload.phone,
+        "service": payload.service.strip() if payload.service else None,
+        "preferred_time": payload.preferred_time,
+        "message": payload.message.strip() if payload.message else None,
+        "status": ContactStatus.new,
+    }
+
+
+def is_spam(payload: ContactCreate) -> bool:
+    """Bots fill the hidden `website` field; people never see it."""
+    return bool(payload.website and payload.website.strip())
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_length: int) -> AsyncIterator[Tuple[int, Optional[str]]]:
+    """
+    Numbered text lines from a UTF-8 byte stream (a leading BOM is dropped).
+    A line longer than `max_length` characters is not buffered: it comes out
+    as None, so a body without newlines cannot grow memory without bound.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending, number, overlong = "", 0, False
+    async for chunk in chunks:
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            number += 1
+            yield number, None if overlong or len(line) > max_length else line.rstrip("\r")
+            overlong = False
+        if len(pending) > max_length:
+            pending, overlong = "", True
+    pending += decoder.decode(b"", final=True)
+    if pending or overlong:
+        yield number + 1, None if overlong or len(pending) > max_length else pending.rstrip("\r")
+
+
+async def iter_ndjson(chunks: AsyncIterator[bytes], max_length: int) -> AsyncIterator[Record]:
+    async for number, line in iter_lines(chunks, max_length):
+        if line is None:
+            yield number, None, f"record longer than {max_length} characters"
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, None, f"invalid JSON: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "expected a JSON object"
+            continue
+        yield number, record, None
+
+
+class _NeedMore(Exception):
+    """The csv reader ran out of buffered lines in the middle of a record."""
+
+
+class _LineFeed:
+    """
+    Input of the one csv.reader in `iter_csv`, topped up from the async line
+    stream. Lines handed to the reader are kept until its record completes,
+    so a record cut short by the end of the buffer is replayed once more
+    lines have arrived (the reader starts every record from a clean state).
+    """
+
+    def __init__(self) -> None:
+        self.pending: Deque[Tuple[int, str]] = deque()
+        self.taken: List[Tuple[int, str]] = []
+
+    def __iter__(self) -> "_LineFeed":
+        return self
+
+    def __next__(self) -> str:
+        if not self.pending:
+            raise _NeedMore
+        number, line = self.pending.popleft()
+        self.taken.append((number, line))
+        return line + "\n"
+
+    def size(self) -> int:
+        return sum(len(line) for _, line in self.taken)
+
+    def start(self) -> int:
+        """Line number of the record just read, which is then forgotten."""
+        number = self.taken[0][0]
+        self.taken.clear()
+        return number
+
+    def replay(self, skip_first: bool = False) -> int:
+        """Give the unfinished record back to the reader; returns its first line number."""
+        number = self.taken[0][0] if self.taken else 0
+        self.pending.extendleft(reversed(self.taken[1:] if skip_first else self.taken))
+        self.taken.clear()
+        return number
+
+
+async def iter_csv(chunks: AsyncIterator[bytes], max_length: int) -> AsyncIterator[Record]:
+    """
+    CSV records keyed by the header row; empty cells are None. Quoting is
+    left to a single csv.reader, so quoted fields may span lines and a stray
+    quote inside an unquoted field is just a character. A record still open
+    after `max_length` characters, or at the end of the body, is reported at
+    its first line and parsing resumes on the line after it.
+    """
+    feed = _LineFeed()
+    reader = csv.reader(feed)
+    header: Optional[List[str]] = None
+    too_long = f"record longer than {max_length} characters"
+
+    def buffered() -> Iterator[Record]:
+        nonlocal header
+        while True:
+            try:
+                fields = next(reader)
+            except _NeedMore:
+                if feed.size() <= max_length:
+                    feed.replay()
+                    return
+                yield feed.replay(skip_first=True), None, too_long
+                continue
+            except csv.Error as exc:
+                yield feed.start(), None, str(exc)
+                continue
+            start = feed.start()
+            if len(fields) <= 1 and not "".join(fields).strip():
+                continue  # blank line
+            if header is None:
+                header = [name.strip() for name in fields]
+            elif len(fields) != len(header):
+                yield start, None, f"expected {len(header)} fields, got {len(fields)}"
+            else:
+                yield start, {name: value or None for name, value in zip(header, fields)}, None
+
+    async for number, line in iter_lines(chunks, max_length):
+        if line is None:
+            yield number, None, too_long
+            continue
+        feed.pending.append((number, line))
+        for record in buffered():
+            yield record
+    while feed.pending:
+        # Only an unterminated quoted field is left over
+        yield feed.pending.popleft()[0], None, "unterminated quoted field"
+        for record in buffered():
+            yield record
+
+
+def _messages(exc: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+        for error in exc.errors()
+    ]
+
+
+async def import_contacts(db, records: AsyncIterator[Record], batch_size: int, max_errors: int) -> Dict[str, Any]:
+    """
+    Validate and insert `records`; returns the counts plus the first
+    `max_errors` per-row errors as {"line": n, "errors": [...]}.
+    """
+    result: Dict[str, Any] = {"inserted": 0, "skipped": 0, "failed": 0, "errors": []}
+    batch: List[Dict[str, Any]] = []
+
+    async def flush() -> None:
+        await db.execute(insert(ContactMessage), batch)
+        await bump_counters(db, messages=len(batch), new_messages=len(batch))
+        await db.commit()
+        result["inserted"] += len(batch)
+        batch.clear()
+
+    async for number, record, error in records:
+        errors = [error] if error else None
+        if record is not None:
+            try:
+                payload = ContactCreate.model_validate(record)
+            except ValidationError as exc:
+                errors = _messages(exc)
+            else:
+                if is_spam(payload):
+                    result["skipped"] += 1
+                    continue
+                batch.append(contact_values(payload))
+        if errors:
+            result["failed"] += 1
+            if len(result["errors"]) < max_errors:
+                result["errors"].append({"line": number, "errors": errors})
+        if len(batch) >= batch_size:
+            await flush()
+    if batch:
+        await flush()
+    return result
@@ -0,0 +1,150 @@
+# app/core/contact_queue.py
+"""
+Write-behind queue for the public contact form (CONTACT_WRITE_BEHIND).
+
+During campaign spikes a commit per form post ties up a pool connection per
+visitor. In write-behind mode `POST /contacts/create` validates the payload,
+puts the row values on a bounded in-process queue and answers 202 with the
+row's `reference`. One flusher task writes what has queued up as a single
+INSERT + counter bump + commit, waiting at most `interval` after the first
+row of a batch and never taking more than `batch_size` rows.
+
+Backpressure: with the queue full, a post waits up to `put_timeout` for
+room, then gets a 503 with Retry-After. A failing flush is retried with
+backoff, so rows are not dropped while the database is briefly away;
+`shutdown()` stops new posts, drains the queue and waits for the flusher.
+Rows still queued when the process is killed are lost, which is the
+trade-off this mode accepts.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import insert
+
+from app.core.config import get_settings
+from app.core.dependencies import db_session_scope
+from app.core.metrics import Counter, Gauge
+from app.core.stats_counters import bump_counters
+from app.models.contacts import ContactMessage
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+rows_written = Counter(
+    "contact_queue_rows_written_total",
+    "Queued contact messages committed.",
+)
+rows_rejected = Counter(
+    "contact_queue_rejected_total",
+    "Contact posts refused with 503 because the queue stayed full.",
+)
+
+MAX_RETRY_DELAY = 30.0
+
+
+class ContactQueue:
+    def __init__(self, max_size: int, batch_size: int, interval: float, put_timeout: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.interval = interval
+        self.put_timeout = put_timeout
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._closing = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._closing
+
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        # Created here so the queue belongs to the serving event loop
+        self._queue = asyncio.Queue(self.max_size)
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def put(self, values: Dict[str, Any]) -> None:
+        if not self.running:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Shutting down")
+        try:
+            await asyncio.wait_for(self._queue.put(values), self.put_timeout)
+        except asyncio.TimeoutError:
+            rows_rejected.inc()
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many submissions right now, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+    async def shutdown(self) -> None:
+        """Refuse new rows, write everything queued, then stop."""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while not (self._closing and self._queue.empty()):
+            batch = await self._next_batch()
+            if batch:
+                await self._write(batch)
+
+    async def _next_batch(self) -> List[Dict[str, Any]]:
+        """Up to batch_size rows, waiting at most `interval` past the first one."""
+        loop = asyncio.get_running_loop()
+        try:
+            # Bounded wait so a shutdown is noticed even when nothing arrives
+            batch = [await asyncio.wait_for(self._queue.get(), self.interval)]
+        except asyncio.TimeoutError:
+            return []
+        deadline = loop.time() + self.interval
+        while len(batch) < self.batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0 or self._closing:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        delay = self.interval or 0.1
+        while True:
+            try:
+                async with db_session_scope() as db:
+                    await db.execute(insert(ContactMessage), batch)
+                    await bump_counters(db, messages=len(batch), new_messages=len(batch))
+                    await db.commit()
+                rows_written.inc(amount=len(batch))
+                return
+            except Exception:
+                if self._closing:
+                    # Don't hold shutdown hostage; the rows go to the log instead
+                    logger.exception("dropping %d queued contact messages: %r", len(batch), batch)
+                    return
+                logger.exception("writing %d queued contact messages failed; retrying in %.1fs", len(batch), delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+
+
+contact_queue = ContactQueue(
+    max_size=settings.contact_queue_max_size,
+    batch_size=settings.contact_queue_batch_size,
+    interval=settings.contact_queue_interval_ms / 1000,
+    put_timeout=settings.contact_queue_put_timeout_seconds,
+)
+
+Gauge(
+    "contact_queue_depth",
+    "Contact messages waiting to be written.",
+    callback=contact_queue.depth,
+)
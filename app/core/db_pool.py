@@ -0,0 +1,116 @@
+# app/core/db_pool.py
+"""
+Connection pool settings and pool metrics for the SQLAlchemy engines.
+
+`engine_options` turns the DB_* pool settings into create_engine kwargs and
+swaps in a QueuePool subclass that times every checkout; `instrument_engine`
+hooks the pool events. Together they report, per engine ("sync"/"async"):
+
+    db_pool_checkout_seconds          time to get a connection (waiting for a
+                                      free one or opening a new one)
+    db_pool_checkout_timeouts_total   checkouts that gave up after DB_POOL_TIMEOUT
+    db_pool_checked_out               connections currently lent out
+    db_pool_overflow                  connections open beyond DB_POOL_SIZE
+    db_pool_size                      configured DB_POOL_SIZE
+    db_pool_invalidations_total       connections discarded (hard/soft)
+
+Each worker process has its own pool, so the database sees up to
+workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections per engine.
+"""
+import time
+from typing import Any, Dict, Type
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import get_settings
+from app.core.metrics import Counter, Gauge, Histogram
+
+settings = get_settings()
+
+checkout_time = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waits and new connects.",
+    ("engine",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+checkout_timeouts = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT.",
+    ("engine",),
+)
+checked_out = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ("engine",),
+)
+overflow = Gauge(
+    "db_pool_overflow",
+    "Connections open beyond the configured pool size.",
+    ("engine",),
+)
+pool_size = Gauge(
+    "db_pool_size",
+    "Configured pool size.",
+    ("engine",),
+)
+invalidations = Counter(
+    "db_pool_invalidations_total",
+    "Pooled connections invalidated, by kind (hard/soft).",
+    ("engine", "kind"),
+)
+
+
+def instrumented_pool(base: Type[QueuePool], name: str) -> Type[QueuePool]:
+    """`base` with timed checkouts, reported under engine=`name`."""
+
+    class InstrumentedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            except PoolTimeout:
+                checkout_timeouts.inc(name)
+                raise
+            finally:
+                checkout_time.observe(time.perf_counter() - started, name)
+
+    InstrumentedPool.__name__ = f"Instrumented{base.__name__}"
+    return InstrumentedPool
+
+
+def engine_options(database_url, name: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine / create_async_engine kwargs from the DB_* settings."""
+    options: Dict[str, Any] = {"query_cache_size": settings.db_statement_cache_size}
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options  # one shared connection, nothing to size
+    options.update(
+        poolclass=instrumented_pool(AsyncAdaptedQueuePool if is_async else QueuePool, name),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Track checked-out / overflow counts and invalidations for `engine`'s pool."""
+
+    def _update(returning: int) -> None:
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            checked_out.set(pool.checkedout() - returning, name)
+            overflow.set(max(pool.overflow(), 0), name)
+
+    event.listen(engine, "checkout", lambda *_: _update(0))
+    # checkin fires before the connection is handed back to the pool
+    event.listen(engine, "checkin", lambda *_: _update(1))
+    event.listen(engine, "invalidate", lambda *_: invalidations.inc(name, "hard"))
+    event.listen(engine, "soft_invalidate", lambda *_: invalidations.inc(name, "soft"))
+    if isinstance(engine.pool, QueuePool):
+        pool_size.set(engine.pool.size(), name)
@@ -1,23 +1,40 @@
 # app/core/dependencies.py (or wherever this lives)
 
-from datetime import datetime, timezone
+from contextlib import asynccontextmanager
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.base import SessionLocal
+from app.core.config import get_settings
+from app.core.identity_cache import CurrentUser, identity_cache
+from app.models.base import ThreadedSession, get_async_sessionmaker, get_sessionmaker
 from app.core.security import decode_access_token
+from app.core.revocation import revoked_tokens
 from app.models.user import User
-from app.models.user import RevokedToken  # <-- FIXED import
 
-def get_db_session():
-    db = SessionLocal()
+settings = get_settings()
+
+async def get_db_session():
+    """
+    Yields an AsyncSession, or a ThreadedSession over the sync engine when
+    DB_ASYNC is off. Both expose the same awaitable API to the routers.
+    """
+    if settings.db_async:
+        async with get_async_sessionmaker()() as db:
+            yield db
+        return
+
+    db = ThreadedSession(get_sessionmaker()())
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+# Same session outside a request (startup hooks, background jobs)
+db_session_scope = asynccontextmanager(get_db_session)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
 
@@ -27,21 +44,22 @@ credentials_exception = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
-def is_revoked(db: Session, jti: Optional[str]) -> bool:
+async def is_revoked(db: AsyncSession, jti: Optional[str]) -> bool:
     if not jti:
         return True
-    # Optional: lightweight cleanup of expired rows
-    db.query(RevokedToken).filter(
-        RevokedToken.expires_at < datetime.now(tz=timezone.utc)
-    ).delete(synchronize_session=False)
-    db.commit()
+    # Answered from the in-process cache; only a periodic read to catch
+    # revocations from other workers touches the DB.
+    await revoked_tokens.sync(db)
+    return revoked_tokens.contains(jti)
 
-    return db.query(RevokedToken).filter(RevokedToken.jti == jti).first() is not None
-
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db_session),
-) -> User:
+    db: AsyncSession = Depends(get_db_session),
+) -> CurrentUser:
+    """
+    The token's user as a read-only `CurrentUser` (see identity_cache). Load
+    the `User` row in the handler's session to change it.
+    """
     try:
         payload = decode_access_token(token)
         username: Optional[str] = payload.get("sub")
@@ -49,7 +67,7 @@ def get_current_user(
         ttype: Optional[str] = payload.get("type")
         if username is None or jti is None or ttype != "access":
             raise credentials_exception
-        if is_revoked(db, jti):
+        if await is_revoked(db, jti):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token revoked",
@@ -58,7 +76,13 @@ def get_current_user(
     except Exception:
         raise credentials_exception
 
-    user = db.query(User).filter(User.username == username).first()
-    if not user:
-        raise credentials_exception
+    user = identity_cache.get(username)
+    if user is None:
+        row = (await db.execute(
+            select(User.id, User.username, User.email, User.is_active).where(User.username == username)
+        )).first()
+        if row is None:
+            raise credentials_exception
+        user = CurrentUser(*row)
+        identity_cache.put(user)
     return user
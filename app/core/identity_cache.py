@@ -0,0 +1,108 @@
+# app/core/identity_cache.py
+"""
+Short-TTL cache of the authenticated user's identity for `get_current_user`.
+
+The SPA sends many requests per page with the same token, and each one
+used to look the user up by username. Now the identity fields are kept per
+process for IDENTITY_CACHE_TTL_SECONDS and handed to handlers as a
+`CurrentUser`: a detached, read-only record, so an authenticated GET that
+needs nothing else never touches the database. Handlers that change the
+user load the row in their own session.
+
+Any committed flush that updates or deletes a User in this process (change
+password, delete, is_active, ...) drops that username at once, through the
+session events below. Other workers see the change when their entry expires,
+so the TTL bounds how long they can act on stale identity. Bulk UPDATEs
+that bypass the ORM are not seen either; they wait out the TTL as well.
+"""
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.metrics import Counter
+from app.models.user import User
+
+settings = get_settings()
+
+lookups = Counter(
+    "identity_cache_requests_total",
+    "Current-user lookups by result (hit: served without a query).",
+    ("result",),
+)
+
+
+class CurrentUser(NamedTuple):
+    id: int
+    username: str
+    email: Optional[str]
+    is_active: Optional[bool]
+
+
+class IdentityCache:
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[CurrentUser, float]]" = OrderedDict()
+
+    def get(self, username: str) -> Optional[CurrentUser]:
+        entry = self._entries.get(username)
+        if entry is None or time.monotonic() >= entry[1]:
+            lookups.inc("miss")
+            return None
+        lookups.inc("hit")
+        self._entries.move_to_end(username)
+        return entry[0]
+
+    def put(self, user: CurrentUser) -> None:
+        if self.ttl <= 0:
+            return
+        self._entries[user.username] = (user, time.monotonic() + self.ttl)
+        self._entries.move_to_end(user.username)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, *usernames: str) -> None:
+        for username in usernames:
+            self._entries.pop(username, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+identity_cache = IdentityCache(
+    ttl=settings.identity_cache_ttl_seconds,
+    max_size=settings.identity_cache_max_size,
+)
+
+
+# --- Invalidation: collect changed usernames per flush, drop them on commit ---
+
+def _stale_usernames(session: Session) -> Set[str]:
+    return session.info.setdefault("identity_cache_stale", set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session: Session, flush_context) -> None:
+    for obj in (*session.dirty, *session.deleted):
+        if isinstance(obj, User):
+            # The old name too, should the username itself have changed
+            history = inspect(obj).attrs.username.history
+            _stale_usernames(session).update(
+                name for name in (obj.username, *history.deleted) if name is not None
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_committed_users(session: Session) -> None:
+    stale = session.info.pop("identity_cache_stale", None)
+    if stale:
+        identity_cache.invalidate(*stale)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop("identity_cache_stale", None)
@@ -0,0 +1,126 @@
+# app/core/image_variants.py
+"""
+Background generation of resized / WebP variants for blog images.
+
+create_blog stores the original and schedules `schedule_variants`; the
+resizing runs in a process pool so it neither blocks the upload response
+nor competes with request handling for the GIL. When it finishes, the
+blog's `image_srcset` is filled in, one srcset string per MIME type:
+
+    {"image/webp": ".../ab12-320.webp 320w, .../ab12-640.webp 640w",
+     "image/png":  ".../ab12-320.png 320w, .../ab12-640.png 640w"}
+"""
+import asyncio
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import update
+
+from app.core.config import get_settings
+from app.core.dependencies import db_session_scope
+from app.core.process_pool import process_pool
+from app.core.response_cache import response_cache
+from app.models.blog import Blog
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+VARIANT_WIDTHS = (320, 640, 1280)
+
+# Pillow format name and MIME type for each fallback extension we resize to
+_FORMATS = {
+    ".jpg": ("JPEG", "image/jpeg"),
+    ".jpeg": ("JPEG", "image/jpeg"),
+    ".png": ("PNG", "image/png"),
+    ".webp": ("WEBP", "image/webp"),
+}
+
+
+def generate_variants(root: str, relative: str, widths: Tuple[int, ...]) -> Dict[str, List[Tuple[int, str]]]:
+    """
+    Runs in a worker process. Writes `<stem>-<width>.webp` plus one in the
+    original format for every width smaller than the source, next to it.
+    Existing files are reused: sources are content-addressed, so a variant
+    that exists is already correct. Returns {mime: [(width, relative path)]}.
+    """
+    from PIL import Image
+
+    stem, ext = os.path.splitext(relative)
+    targets = [(".webp", "WEBP", "image/webp")]
+    if ext.lower() in _FORMATS and ext.lower() != ".webp":
+        targets.append((ext, *_FORMATS[ext.lower()]))
+
+    out: Dict[str, List[Tuple[int, str]]] = {}
+    with Image.open(os.path.join(root, relative)) as source:
+        source.load()
+        for width in sorted(w for w in widths if w < source.width):
+            height = max(1, round(source.height * width / source.width))
+            resized = None
+            for suffix, fmt, mime in targets:
+                variant = f"{stem}-{width}{suffix}"
+                path = os.path.join(root, variant)
+                if not os.path.exists(path):
+                    if resized is None:
+                        resized = source.resize((width, height), Image.LANCZOS)
+                    image = resized.convert("RGB") if fmt == "JPEG" else resized
+                    tmp = f"{path}.tmp"
+                    image.save(tmp, format=fmt, optimize=True)
+                    os.replace(tmp, path)
+                out.setdefault(mime, []).append((width, variant))
+    return out
+
+
+def to_srcset(variants: Dict[str, List[Tuple[int, str]]], url_root: str) -> Dict[str, str]:
+    return {
+        mime: ", ".join(f"{url_root}/{path} {width}w" for width, path in entries)
+        for mime, entries in variants.items()
+    }
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_tasks: Set[asyncio.Task] = set()
+
+
+def _pool() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = process_pool(settings.image_workers)
+    return _executor
+
+
+async def _build(blog_id: int, root: str, relative: str, url_root: str) -> None:
+    try:
+        loop = asyncio.get_running_loop()
+        variants = await loop.run_in_executor(_pool(), generate_variants, root, relative, VARIANT_WIDTHS)
+        if not variants:
+            return
+        async with db_session_scope() as db:
+            await db.execute(
+                update(Blog)
+                .where(Blog.id == blog_id)
+                .values(image_srcset=to_srcset(variants, url_root))
+                .execution_options(synchronize_session=False)
+            )
+            await db.commit()
+        response_cache.invalidate("blogs", f"blog:{blog_id}")
+    except Exception:
+        logger.exception("image variants failed for blog %s (%s)", blog_id, relative)
+
+
+def schedule_variants(blog_id: int, root: str, relative: str, url_root: str) -> None:
+    """Fire-and-forget: the upload response does not wait for this."""
+    task = asyncio.create_task(_build(blog_id, root, relative, url_root))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def shutdown() -> None:
+    global _executor
+    for task in list(_tasks):
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
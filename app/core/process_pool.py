@@ -0,0 +1,17 @@
+# app/core/process_pool.py
+"""
+Process pools that are safe to start inside the running server.
+
+Pools here are created lazily, with the server's threads (threadpool,
+aiosqlite) already running, so workers must not be forked from it: a child
+could inherit a lock one of those threads holds. forkserver forks them from
+a clean single-threaded helper instead; spawn is the fallback where
+forkserver is unavailable.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context(method))
@@ -0,0 +1,153 @@
+# app/core/rate_limit.py
+"""
+Admission control for the public endpoints.
+
+Two checks run before a request reaches routing, dependencies or the DB:
+
+- A global concurrency cap (MAX_CONCURRENT_REQUESTS): past it, requests
+  are shed at once with 503, so a burst queues in clients rather than in
+  the threadpool and the connection pool.
+- Token buckets keyed by client IP and route (RATE_LIMITS), e.g.
+  {"POST /users/login": "5/minute"}: each key may burst up to N requests,
+  then gets N per period; beyond that a 429 with Retry-After.
+
+The in-memory backend needs no lock: a worker's buckets are only touched
+from its event loop, and `take` never awaits between reading and writing a
+bucket. It is per worker, so with W workers a client gets up to W times
+the limit; RATE_LIMIT_BACKEND="package.module:factory" swaps in a shared
+backend (a `RateLimitBackend` subclass).
+
+The client IP is the ASGI peer address; behind a proxy, run uvicorn with
+--proxy-headers / --forwarded-allow-ips so that is the real client.
+"""
+import importlib
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Tuple
+
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import Counter
+
+rate_limited = Counter(
+    "http_rate_limited_total",
+    "Requests refused with 429 by the per-client rate limit.",
+    ("route",),
+)
+shed = Counter(
+    "http_requests_shed_total",
+    "Requests refused with 503 because MAX_CONCURRENT_REQUESTS were in flight.",
+)
+
+PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0}
+
+# Never shed or limit the scrape that would show the overload
+EXEMPT_PATHS = ("/metrics",)
+
+
+def parse_rate(spec: str) -> Tuple[float, int]:
+    """"10/minute" -> (tokens per second, burst size)."""
+    count, _, period = spec.partition("/")
+    try:
+        burst = int(count)
+        seconds = PERIODS[period.strip().rstrip("s")]
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid rate {spec!r}; use e.g. '10/minute'") from None
+    if burst < 1:
+        raise ValueError(f"Invalid rate {spec!r}; the count must be at least 1")
+    return burst / seconds, burst
+
+
+class RateLimitBackend(ABC):
+    @abstractmethod
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        """Spend one token from `key`'s bucket: 0 if allowed, else seconds until one is available."""
+
+
+class MemoryBackend(RateLimitBackend):
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, updated); insertion order doubles as LRU order
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    async def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            # Least recently seen client; its bucket has had the longest to refill
+            del self._buckets[next(iter(self._buckets))]
+        return wait
+
+
+def load_backend(spec: str, max_keys: int) -> RateLimitBackend:
+    """"memory", or "package.module:factory" for a backend shared by workers."""
+    if spec == "memory":
+        return MemoryBackend(max_keys)
+    module, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module), attr)()
+
+
+class RateLimitMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Dict[str, str],
+        backend: RateLimitBackend,
+        max_concurrent: int = 0,
+    ):
+        self.app = app
+        self.rules = {route: parse_rate(spec) for route, spec in rules.items()}
+        self.backend = backend
+        self.max_concurrent = max_concurrent
+        self.in_flight = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+        if path in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        if self.max_concurrent and self.in_flight >= self.max_concurrent:
+            shed.inc()
+            await self._refuse(503, "Server busy, please retry", 1, scope, receive, send)
+            return
+
+        route = f"{scope['method']} {path}"
+        rule = self.rules.get(route)
+        if rule is not None:
+            client = scope.get("client")
+            wait = await self.backend.take(f"{client[0] if client else '-'} {route}", *rule)
+            if wait:
+                rate_limited.inc(route)
+                await self._refuse(429, "Too many requests", wait, scope, receive, send)
+                return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    async def _refuse(status_code: int, detail: str, retry_after: float,
+                      scope: Scope, receive: Receive, send: Send) -> None:
+        response = ORJSONResponse(
+            {"detail": detail},
+            status_code=status_code,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, receive, send)
@@ -0,0 +1,131 @@
+# app/core/request_metrics.py
+"""
+Per-route HTTP metrics, exposed at /metrics:
+
+    http_requests_total{method,route,status}
+    http_requests_in_flight
+    http_request_duration_seconds{method,route,status}
+    http_request_db_seconds{method,route}      time spent in SQL per request
+
+`route` is the path template ("/blogs/{blog_id}"), the mount prefix for
+mounted apps ("/static"), or "<unmatched>" so unknown URLs can't blow up
+label cardinality. DB time is summed by cursor-execute hooks into a
+per-request holder carried in a context variable, which follows the request
+into the threadpool (DB_ASYNC=false) and the async driver's greenlet.
+
+`python -m benchmarks.metrics_overhead` measures what this adds per request.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status.",
+    ("method", "route", "status"),
+)
+latency = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last response byte.",
+    ("method", "route", "status"),
+)
+db_time = Histogram(
+    "http_request_db_seconds",
+    "Time a request spent executing SQL.",
+    ("method", "route"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+UNMATCHED = "<unmatched>"
+
+
+class RequestDB:
+    """SQL done on behalf of the current request."""
+
+    __slots__ = ("seconds", "statements", "shapes")
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.statements = 0
+        # statement -> count, only while the SQL profiler is on (app.core.sql_profiler)
+        self.shapes = None
+
+
+current_db: ContextVar[Optional[RequestDB]] = ContextVar("current_db", default=None)
+
+
+def track_db_time(engine: Engine) -> None:
+    """Add every statement `engine` executes to the current request's RequestDB."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._request_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stats = current_db.get()
+        if stats is not None:
+            stats.seconds += time.perf_counter() - context._request_started
+            stats.statements += 1
+            if stats.shapes is not None:
+                stats.shapes[statement] += 1
+
+
+def route_label(scope: Scope, root_path: str) -> str:
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    # Mounts rewrite root_path instead of recording a route
+    mounted = scope.get("root_path", "")[len(root_path):]
+    return mounted or UNMATCHED
+
+
+class MetricsMiddleware:
+    # Plain int read by the gauge at render time: cheaper than a locked Gauge.inc
+    # and exact, since every request runs on the event loop thread
+    in_flight = 0
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        root_path = scope.get("root_path", "")
+        stats = RequestDB()
+        token = current_db.set(stats)
+        MetricsMiddleware.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            MetricsMiddleware.in_flight -= 1
+            current_db.reset(token)
+            method, route, status = scope["method"], route_label(scope, root_path), str(status_code)
+            requests_total.inc(method, route, status)
+            latency.observe(elapsed, method, route, status)
+            db_time.observe(stats.seconds, method, route)
+
+
+Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled.",
+    callback=lambda: MetricsMiddleware.in_flight,
+)
@@ -0,0 +1,152 @@
+# app/core/response_cache.py
+"""
+Serialized-response cache for the public read endpoints (FAQs and blogs).
+
+Entries are the final JSON bytes, kept in an LRU bounded by total size and
+expiring after a TTL. Each entry carries tags ("faqs", "faq:3", ...) and the
+write handlers invalidate exactly the tags they touch after committing.
+
+A read that misses may still be querying when a write commits and
+invalidates; storing its result afterwards would cache the old rows until
+the TTL. So `get` stamps the request with the invalidation clock on a miss,
+every `invalidate` records the clock value per tag, and `store` drops the
+result if any of its tags was invalidated after that stamp.
+
+The cache is per process: other workers only see a change once their copy
+expires, so keep the TTL short enough to bound that staleness.
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, NamedTuple, Optional, Set
+
+from fastapi import Request, Response
+
+from app.core.config import get_settings
+from app.core.metrics import Counter, Gauge
+
+settings = get_settings()
+
+lookups = Counter(
+    "response_cache_requests_total",
+    "Response cache lookups by result (hit/miss).",
+    ("result",),
+)
+evictions = Counter(
+    "response_cache_evictions_total",
+    "Entries dropped to stay under the byte limit.",
+)
+
+
+class _Entry(NamedTuple):
+    body: bytes
+    headers: Dict[str, str]
+    expires: float
+    tags: Iterable[str]
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        # Bumped by every invalidate(); tag -> clock value of its last invalidation
+        self._clock = 0
+        self._invalidated: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    @staticmethod
+    def key_for(request: Request) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+        return f"{request.url.path}?{query}"
+
+    def get(self, request: Request) -> Optional[Response]:
+        """Cached response for this request, or None (counted as a miss)."""
+        if not self.enabled:
+            return None
+        key = self.key_for(request)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires <= time.monotonic():
+            if entry is not None:
+                self._drop(key)
+            lookups.inc("miss")
+            request.state.response_cache_clock = self._clock
+            return None
+        self._entries.move_to_end(key)
+        lookups.inc("hit")
+        return self._response(entry.body, entry.headers, "HIT")
+
+    def store(self, request: Request, body: bytes, tags: Iterable[str],
+              headers: Optional[Dict[str, str]] = None) -> Response:
+        """
+        Cache `body` under this request and return it as the response. Not
+        cached if one of `tags` was invalidated since this request's miss in
+        `get` (or there was none), as `body` may predate that write.
+        """
+        headers = headers or {}
+        tags = tuple(tags)
+        if self.enabled and len(body) <= self.max_bytes and self._fresh(request, tags):
+            key = self.key_for(request)
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(body, headers, time.monotonic() + self.ttl, tags)
+            self.size += len(body)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self.size > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                evictions.inc()
+        return self._response(body, headers, "MISS")
+
+    def invalidate(self, *tags: str) -> None:
+        self._clock += 1
+        for tag in tags:
+            self._invalidated[tag] = self._clock
+            for key in self._tags.pop(tag, ()):
+                self._drop(key)
+
+    def _fresh(self, request: Request, tags: Iterable[str]) -> bool:
+        stamp = getattr(request.state, "response_cache_clock", None)
+        return stamp is not None and all(self._invalidated.get(tag, 0) <= stamp for tag in tags)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+        self._invalidated.clear()
+        self.size = 0
+
+    def _drop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size -= len(entry.body)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    @staticmethod
+    def _response(body: bytes, headers: Dict[str, str], state: str) -> Response:
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={**headers, "X-Cache": state},
+        )
+
+
+response_cache = ResponseCache(
+    max_bytes=settings.response_cache_max_bytes,
+    ttl=settings.response_cache_ttl_seconds,
+)
+
+Gauge(
+    "response_cache_bytes",
+    "Bytes of serialized responses held in the cache.",
+    callback=lambda: response_cache.size,
+)
@@ -0,0 +1,144 @@
+# app/core/revocation.py
+import hashlib
+import heapq
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.models.user import RevokedToken
+
+settings = get_settings()
+
+
+class BloomFilter:
+    """
+    Plain bit-array Bloom filter. A miss means "definitely not present",
+    so it can answer the common not-revoked case without touching the dict.
+    """
+
+    def __init__(self, capacity: int = 100_000, hashes: int = 7):
+        # ~10 bits per item keeps false positives around 1% at capacity
+        self.size = max(capacity * 10, 1024)
+        self.hashes = hashes
+        self.bits = bytearray(self.size // 8 + 1)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationCache:
+    """
+    In-memory set of revoked JTIs, each dropped once its token's `exp` passes
+    (an expired token is rejected by signature validation anyway).
+
+    Loaded from `revoked_tokens` at startup and updated by /users/logout.
+    Revocations written by other workers are picked up by `sync()`, at most
+    every `sync_seconds`. It re-reads a window of `revoked_at` rather than
+    "ids above the last seen": ids are assigned at INSERT and can commit out
+    of order, so a row with a lower id can appear after a higher one was
+    read. The window reaches `sync_slack` seconds before the previous sync,
+    which covers a logout's time from `revoked_at` to commit plus clock skew
+    between workers; rows already known are skipped.
+    """
+
+    def __init__(self, use_bloom: bool = False, sync_seconds: float = 5.0, sync_slack: float = 60.0):
+        self.use_bloom = use_bloom
+        self.sync_seconds = sync_seconds
+        self.sync_slack = sync_slack
+        self._expires: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+        self._bloom: Optional[BloomFilter] = BloomFilter() if use_bloom else None
+        self._bloom_items = 0
+        self._loaded_at: Optional[float] = None  # wall clock when the last load started
+        self._last_sync = 0.0
+        self._syncing = False
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def add(self, jti: str, exp: float) -> None:
+        if exp <= time.time() or self._expires.get(jti) == exp:
+            return
+        self._expires[jti] = exp
+        heapq.heappush(self._heap, (exp, jti))
+        if self._bloom is not None:
+            self._bloom.add(jti)
+            self._bloom_items += 1
+
+    def contains(self, jti: str) -> bool:
+        self._purge()
+        if self._bloom is not None and jti not in self._bloom:
+            return False
+        return jti in self._expires
+
+    def _purge(self) -> None:
+        now = time.time()
+        purged = False
+        while self._heap and self._heap[0][0] <= now:
+            exp, jti = heapq.heappop(self._heap)
+            if self._expires.get(jti) == exp:
+                del self._expires[jti]
+                purged = True
+        # Bloom filters can't delete; rebuild once most of its keys are stale
+        if purged and self._bloom is not None and len(self._expires) * 2 < self._bloom_items:
+            self._bloom = BloomFilter()
+            for key in self._expires:
+                self._bloom.add(key)
+            self._bloom_items = len(self._expires)
+
+    async def load(self, db) -> int:
+        """
+        Pull unexpired revocations: all of them the first time, then those
+        revoked since `sync_slack` before the previous load. Returns rows read.
+        """
+        started = time.time()
+        stmt = select(RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > datetime.fromtimestamp(started, tz=timezone.utc)
+        )
+        if self._loaded_at is not None:
+            since = datetime.fromtimestamp(self._loaded_at - self.sync_slack, tz=timezone.utc)
+            stmt = stmt.where(RevokedToken.revoked_at >= since)
+        rows = (await db.execute(stmt)).all()
+        for jti, expires_at in rows:
+            if expires_at.tzinfo is None:  # SQLite drops the tz
+                expires_at = expires_at.replace(tzinfo=timezone.utc)
+            self.add(jti, expires_at.timestamp())
+        self._loaded_at = started
+        self._last_sync = time.monotonic()
+        return len(rows)
+
+    async def sync(self, db) -> None:
+        """
+        Load if the last load is `sync_seconds` old. While one request is
+        loading, concurrent ones go on with the current set instead of
+        sending the same query.
+        """
+        if self.sync_seconds <= 0 or self._syncing:
+            return
+        if time.monotonic() - self._last_sync >= self.sync_seconds:
+            self._syncing = True
+            try:
+                await self.load(db)
+            finally:
+                self._syncing = False
+
+
+revoked_tokens = RevocationCache(
+    use_bloom=settings.revocation_bloom,
+    sync_seconds=settings.revocation_sync_seconds,
+    sync_slack=settings.revocation_sync_slack_seconds,
+)
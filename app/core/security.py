@@ -1,24 +1,89 @@
 # app/core/security.py
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Callable, Optional, Tuple
 from uuid import uuid4
 
-from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.core.metrics import Counter
+from app.core.password_pool import password_pool
 
-# ---- Load config from pydantic settings (cached) ----
-_settings = get_settings()
-SECRET_KEY: str = _settings.secret_key
-ALGORITHM: str = _settings.algorithm
-ACCESS_TOKEN_EXPIRE_MINUTES: int = getattr(_settings, "access_token_expire_minutes", 30)
+claims_lookups = Counter(
+    "jwt_claims_cache_requests_total",
+    "Access-token decodes by result (hit: served from the claims cache).",
+    ("result",),
+)
 
-# Fail fast if required settings are missing
-if not SECRET_KEY:
-    raise RuntimeError("SECRET_KEY is not set in settings/.env")
-if not ALGORITHM:
-    raise RuntimeError("ALGORITHM is not set in settings/.env (e.g., HS256)")
+class InvalidTokenError(Exception):
+    """Bad signature, expired, or malformed, whichever JWT backend is in use."""
+
+# ---- Config from pydantic settings, read on first use (cached) ----
+@lru_cache()
+def _jwt_settings() -> Tuple[str, str, int]:
+    settings = get_settings()
+    # Fail fast if required settings are missing
+    if not settings.secret_key:
+        raise RuntimeError("SECRET_KEY is not set in settings/.env")
+    if not settings.algorithm:
+        raise RuntimeError("ALGORITHM is not set in settings/.env (e.g., HS256)")
+    expire_minutes = getattr(settings, "access_token_expire_minutes", 30)
+    return settings.secret_key, settings.algorithm, expire_minutes
+
+@lru_cache()
+def _jwt_backend() -> Tuple[Callable[..., str], Callable[..., Dict[str, Any]], Tuple[type, ...]]:
+    """(encode, decode, errors) of the JWT_BACKEND library; both take the same arguments."""
+    backend = get_settings().jwt_backend
+    if backend == "python-jose":
+        from jose import JWTError, jwt
+        return jwt.encode, jwt.decode, (JWTError,)
+    if backend == "pyjwt":
+        import jwt
+        return jwt.encode, jwt.decode, (jwt.PyJWTError,)
+    raise RuntimeError(f"JWT_BACKEND must be 'python-jose' or 'pyjwt', not {backend!r}")
+
+class ClaimsCache:
+    """
+    LRU of verified claims keyed by a SHA-256 of the token (tokens themselves
+    are not kept). An entry is dropped once the token's `exp` passes, so a
+    hit is never a token the backend would reject as expired.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() >= entry[1]:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key: bytes, claims: Dict[str, Any], exp: float) -> None:
+        self._entries[key] = (claims, exp)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+@lru_cache()
+def claims_cache() -> Optional[ClaimsCache]:
+    size = get_settings().jwt_claims_cache_size
+    return ClaimsCache(size) if size > 0 else None
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -32,20 +97,54 @@ def hash_password(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+# Async variants: run on the dedicated bcrypt pool (503 when it is saturated)
+async def get_password_hash_async(password: str) -> str:
+    return await password_pool.run(get_password_hash, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
 def create_access_token(data: Dict[str, Any]) -> str:
     """
     Creates a short-lived access token with `exp` and `jti`.
     Expects `data` to already include {"sub": "<username>"}.
     """
+    secret_key, algorithm, expire_minutes = _jwt_settings()
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + timedelta(minutes=expire_minutes)
     to_encode.update({
         "exp": expire,
         "jti": str(uuid4()),
         "type": "access",
     })
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encode, _, _ = _jwt_backend()
+    return encode(to_encode, secret_key, algorithm=algorithm)
+
+def _verify_token(token: str) -> Dict[str, Any]:
+    secret_key, algorithm, _ = _jwt_settings()
+    _, decode, errors = _jwt_backend()
+    try:
+        # `algorithms` must be a list
+        return decode(token, secret_key, algorithms=[algorithm])
+    except errors as exc:
+        raise InvalidTokenError(str(exc)) from exc
 
 def decode_access_token(token: str) -> Dict[str, Any]:
-    # `algorithms` must be a list
-    return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    """
+    Verified claims of `token`; raises InvalidTokenError. Repeat calls with
+    the same token are answered from the claims cache until it expires.
+    """
+    cache = claims_cache()
+    if cache is None:
+        return _verify_token(token)
+    key = cache.key(token)
+    claims = cache.get(key)
+    if claims is None:
+        claims_lookups.inc("miss")
+        claims = _verify_token(token)
+        if isinstance(claims.get("exp"), (int, float)):
+            cache.put(key, claims, claims["exp"])
+    else:
+        claims_lookups.inc("hit")
+    # Callers get their own copy; the cached one stays as verified
+    return dict(claims)
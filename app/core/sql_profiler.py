@@ -0,0 +1,86 @@
+# app/core/sql_profiler.py
+"""
+Per-request SQL profile and N+1 detector (SQL_PROFILE; on by default when
+DEBUG is). Every response gets a Server-Timing header, visible in the
+browser's network panel:
+
+    Server-Timing: db;dur=3.8;desc="queries=7", db-repeat;desc="5x SELECT users.id ..."
+
+and a warning is logged whenever one statement shape runs
+SQL_PROFILE_REPEAT_THRESHOLD or more times in a single request, which is
+what a lazy load inside a loop looks like. Statement counting and timing
+come from the request_metrics cursor hooks; this adds the shape tally.
+"""
+import logging
+import re
+from collections import Counter
+from typing import List, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.request_metrics import RequestDB, current_db
+
+logger = logging.getLogger(__name__)
+
+# Expanded IN lists: "(?, ?, ?)" / "($1, $2)" / "(%(p_1)s, %(p_2)s)"
+_BIND = r"(?:\?|\$\d+|%\(\w+\)s|:\w+)"
+_IN_LIST = re.compile(rf"\(\s*{_BIND}(?:\s*,\s*{_BIND})+\s*\)")
+_HEADER_UNSAFE = re.compile(r'["\\\r\n]')
+
+
+def statement_shape(statement: str) -> str:
+    """`statement` with whitespace collapsed and IN lists of any length made equal."""
+    return _IN_LIST.sub("(...)", " ".join(statement.split()))
+
+
+def repeated_shapes(shapes: Counter, threshold: int) -> List[Tuple[str, int]]:
+    """Statement shapes run at least `threshold` times, most repeated first."""
+    by_shape: Counter = Counter()
+    for statement, count in shapes.items():
+        by_shape[statement_shape(statement)] += count
+    return [(shape, count) for shape, count in by_shape.most_common() if count >= threshold]
+
+
+def server_timing(stats: RequestDB, repeats: List[Tuple[str, int]]) -> str:
+    value = f'db;dur={stats.seconds * 1000:.1f};desc="queries={stats.statements}"'
+    if repeats:
+        shape, count = repeats[0]
+        desc = _HEADER_UNSAFE.sub("", shape[:80]).encode("ascii", "replace").decode()
+        value += f', db-repeat;desc="{count}x {desc}"'
+    return value
+
+
+class SQLProfilerMiddleware:
+    def __init__(self, app: ASGIApp, repeat_threshold: int = 3):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # MetricsMiddleware normally installed the holder already
+        stats = current_db.get()
+        token = None
+        if stats is None:
+            stats = RequestDB()
+            token = current_db.set(stats)
+        stats.shapes = Counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                repeats = repeated_shapes(stats.shapes, self.repeat_threshold)
+                MutableHeaders(scope=message).append("Server-Timing", server_timing(stats, repeats))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if token is not None:
+                current_db.reset(token)
+            for shape, count in repeated_shapes(stats.shapes, self.repeat_threshold):
+                logger.warning(
+                    "possible N+1: %s %s ran %dx: %s", scope["method"], scope["path"], count, shape
+                )
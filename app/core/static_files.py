@@ -0,0 +1,116 @@
+# app/core/static_files.py
+"""
+StaticFiles for /static with proper caching.
+
+- Content-hashed paths (uploads are stored as <sha256><ext>, variants as
+  <sha256>-<width><ext>) never change, so they get a year-long
+  `immutable` Cache-Control; everything else gets STATIC_MAX_AGE.
+- Text assets are served from prebuilt `.br` / `.gz` siblings when the
+  client accepts them. Build them at deploy time with
+  `python -m app.core.static_files static`.
+- ETag / 304, byte ranges and zero-copy `http.response.pathsend` (when the
+  server advertises it) come from Starlette's FileResponse.
+"""
+import argparse
+import gzip
+import os
+import re
+from mimetypes import guess_type
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+try:  # optional: brotli siblings are only built / served when installed
+    import brotli
+except ImportError:
+    brotli = None
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+HASHED_NAME = re.compile(r"(^|/)[0-9a-f]{64}(-\d+)?\.[a-z0-9]+$")
+COMPRESSIBLE = {".css", ".html", ".js", ".json", ".map", ".svg", ".txt", ".xml"}
+# Preferred first
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+class CachedStaticFiles(StaticFiles):
+    def __init__(self, *args, max_age: int = 3600, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_age = max_age
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope,
+                      status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        path = str(full_path)
+        headers = {
+            "Cache-Control": IMMUTABLE if HASHED_NAME.search(path.replace(os.sep, "/"))
+            else f"public, max-age={self.max_age}"
+        }
+
+        response = None
+        if os.path.splitext(path)[1].lower() in COMPRESSIBLE:
+            headers["Vary"] = "Accept-Encoding"
+            accepted = {
+                token.split(";")[0].strip()
+                for token in request_headers.get("accept-encoding", "").split(",")
+                if "q=0" not in token.replace(" ", "").split(";")[1:]
+            }
+            for encoding, suffix in ENCODINGS:
+                if encoding not in accepted:
+                    continue
+                try:
+                    compressed_stat = os.stat(path + suffix)
+                except OSError:
+                    continue
+                response = FileResponse(
+                    path + suffix,
+                    status_code=status_code,
+                    stat_result=compressed_stat,
+                    media_type=guess_type(path)[0] or "text/plain",
+                    headers={**headers, "Content-Encoding": encoding},
+                )
+                break
+
+        if response is None:
+            response = FileResponse(full_path, status_code=status_code, stat_result=stat_result, headers=headers)
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def precompress(directory: str, min_size: int = 1024) -> int:
+    """Write .gz (and .br with brotli installed) next to text assets. Returns files written."""
+    written = 0
+    for dirpath, _, filenames in os.walk(directory):
+        for name in filenames:
+            if os.path.splitext(name)[1].lower() not in COMPRESSIBLE:
+                continue
+            source = os.path.join(dirpath, name)
+            stat = os.stat(source)
+            if stat.st_size < min_size:
+                continue
+            with open(source, "rb") as f:
+                data = f.read()
+            outputs = [(".gz", lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+            if brotli is not None:
+                outputs.append((".br", lambda d: brotli.compress(d, quality=11)))
+            for suffix, compress in outputs:
+                target = source + suffix
+                if os.path.exists(target) and os.stat(target).st_mtime >= stat.st_mtime:
+                    continue
+                with open(target, "wb") as f:
+                    f.write(compress(data))
+                written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prebuild .gz/.br siblings for static text assets.")
+    parser.add_argument("directory", nargs="?", default="static")
+    args = parser.parse_args()
+    print(f"wrote {precompress(args.directory)} compressed files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# app/core/stats_counters.py
+"""
+Keeps the `stats_counters` row behind /dashboard/stats in step with the data.
+
+Write paths call `bump_counters` before committing, so a counter moves in
+the same transaction as the row it counts. `reconcile_counters` recomputes
+exact totals, to repair drift from writes that bypass the API (imports,
+manual SQL). It runs at startup when the row is missing, periodically from
+the app lifespan, or once from cron:
+
+    python -m app.core.stats_counters
+"""
+import argparse
+import asyncio
+import logging
+from typing import Dict
+
+from sqlalchemy import func, insert, select, update
+
+from app.core.config import get_settings
+from app.core.dependencies import db_session_scope
+from app.models import faq  # noqa: F401  (register all mappers for CLI runs)
+from app.models.base import dispose_engines
+from app.models.blog import Blog
+from app.models.contacts import ContactMessage, ContactStatus
+from app.models.stats import STATS_ROW_ID, StatsCounters
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+COUNTERS = ("users", "blogs", "messages", "new_messages")
+
+
+async def bump_counters(db, **deltas: int) -> None:
+    """
+    Add `deltas` (e.g. users=1) to the counters row inside the caller's
+    transaction; the caller commits. A missing row is left for the
+    reconciler to create.
+    """
+    values = {name: getattr(StatsCounters, name) + delta for name, delta in deltas.items() if delta}
+    if values:
+        await db.execute(
+            update(StatsCounters)
+            .where(StatsCounters.id == STATS_ROW_ID)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+
+
+async def reconcile_counters(db) -> Dict[str, int]:
+    """
+    Recompute every counter exactly and commit. The counters row is locked
+    first, so writers committing meanwhile either land before the counts
+    are taken or apply their bump on top of the result.
+    """
+    locked = await db.scalar(
+        select(StatsCounters.id).where(StatsCounters.id == STATS_ROW_ID).with_for_update()
+    )
+    exact = {
+        "users": await db.scalar(select(func.count()).select_from(User)),
+        "blogs": await db.scalar(select(func.count()).select_from(Blog)),
+        "messages": await db.scalar(select(func.count()).select_from(ContactMessage)),
+        "new_messages": await db.scalar(
+            select(func.count()).select_from(ContactMessage).where(ContactMessage.status == ContactStatus.new)
+        ),
+    }
+    if locked is None:
+        await db.execute(insert(StatsCounters).values(id=STATS_ROW_ID, **exact))
+    else:
+        await db.execute(
+            update(StatsCounters)
+            .where(StatsCounters.id == STATS_ROW_ID)
+            .values(exact)
+            .execution_options(synchronize_session=False)
+        )
+    await db.commit()
+    return exact
+
+
+async def read_counters(db) -> Dict[str, int]:
+    """Current counters: one primary-key read, reconciling if the row is missing."""
+    row = (await db.execute(
+        select(*(getattr(StatsCounters, name) for name in COUNTERS)).where(StatsCounters.id == STATS_ROW_ID)
+    )).first()
+    if row is None:
+        return await reconcile_counters(db)
+    return dict(zip(COUNTERS, row))
+
+
+async def reconcile_once() -> Dict[str, int]:
+    async with db_session_scope() as db:
+        exact = await reconcile_counters(db)
+    logger.info("stats counters reconciled: %s", exact)
+    return exact
+
+
+async def run_reconciler(interval: float) -> None:
+    """Reconcile every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await reconcile_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("stats counter reconciliation failed")
+
+
+def main() -> None:
+    argparse.ArgumentParser(description="Recompute the dashboard stats counters.").parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    exact = asyncio.run(_reconcile_and_dispose())
+    print(" ".join(f"{name}={value}" for name, value in exact.items()))
+
+
+async def _reconcile_and_dispose() -> Dict[str, int]:
+    try:
+        return await reconcile_once()
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
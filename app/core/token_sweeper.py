@@ -0,0 +1,93 @@
+# app/core/token_sweeper.py
+"""
+Deletes expired rows from `revoked_tokens` outside the request path.
+
+Runs as a background task from the app lifespan, or once from cron:
+
+    python -m app.core.token_sweeper [--batch-size N]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Tuple
+
+from sqlalchemy import delete, select
+
+from app.core.config import get_settings
+from app.core.dependencies import db_session_scope
+from app.models import blog, contacts, faq  # noqa: F401  (register all mappers for CLI runs)
+from app.models.base import dispose_engines
+from app.models.user import RevokedToken
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+async def sweep_expired_tokens(db, batch_size: int) -> Tuple[int, float]:
+    """
+    Delete expired rows in batches of `batch_size`, committing after each so
+    no single transaction holds many row locks.
+    Returns (rows deleted, seconds taken).
+    """
+    started = time.perf_counter()
+    cutoff = datetime.now(tz=timezone.utc)
+    deleted = 0
+    while True:
+        batch = (
+            select(RevokedToken.id)
+            .where(RevokedToken.expires_at < cutoff)
+            .limit(batch_size)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            delete(RevokedToken)
+            .where(RevokedToken.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            break
+    return deleted, time.perf_counter() - started
+
+
+async def sweep_once(batch_size: int) -> Tuple[int, float]:
+    async with db_session_scope() as db:
+        deleted, elapsed = await sweep_expired_tokens(db, batch_size)
+    logger.info("token sweep removed %d expired revoked tokens in %.3fs", deleted, elapsed)
+    return deleted, elapsed
+
+
+async def run_sweeper(interval: float, batch_size: int) -> None:
+    """Sweep every `interval` seconds until cancelled."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sweep_once(batch_size)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("token sweep failed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete expired revoked tokens.")
+    parser.add_argument("--batch-size", type=int, default=settings.token_sweep_batch_size)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    deleted, elapsed = asyncio.run(_sweep_and_dispose(args.batch_size))
+    print(f"deleted={deleted} seconds={elapsed:.3f}")
+
+
+async def _sweep_and_dispose(batch_size: int) -> Tuple[int, float]:
+    try:
+        return await sweep_once(batch_size)
+    finally:
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# app/core/ttl_cache.py
+"""
+Short-TTL, single-flight cache for computed results (the dashboard endpoints).
+
+Every admin tab polls the dashboard, so identical queries arrive together.
+`TTLCache.get(key, load)` returns the cached value while it is fresh; on a
+miss only one `load()` runs per key and concurrent callers await that same
+task. With `stale_ttl > 0` an expired value is still served for that long
+while a background refresh replaces it, so readers never wait on a reload.
+
+Loaders run as their own tasks (a caller disconnecting doesn't cancel the
+load others are waiting on), so they must open their own DB session.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, NamedTuple
+
+from app.core.config import get_settings
+from app.core.metrics import Counter
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+lookups = Counter(
+    "ttl_cache_requests_total",
+    "TTL cache lookups by cache and result (hit/stale/coalesced/miss).",
+    ("cache", "result"),
+)
+
+
+class _Entry(NamedTuple):
+    value: Any
+    fresh_until: float
+    stale_until: float
+
+
+class TTLCache:
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: Dict[str, _Entry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        if self.ttl <= 0:
+            return await load()
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and now < entry.fresh_until:
+            lookups.inc(self.name, "hit")
+            return entry.value
+        if entry is not None and now < entry.stale_until:
+            lookups.inc(self.name, "stale")
+            self._refresh(key, load)
+            return entry.value
+
+        lookups.inc(self.name, "coalesced" if key in self._inflight else "miss")
+        return await asyncio.shield(self._refresh(key, load))
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def shutdown(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+        await asyncio.gather(*self._inflight.values(), return_exceptions=True)
+
+    def _refresh(self, key: str, load: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, load))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        return task
+
+    async def _load(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        value = await load()
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        return value
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        # Background refreshes have no awaiting caller; log their failures here
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("%s cache load failed for %r", self.name, key, exc_info=task.exception())
+
+
+dashboard_cache = TTLCache(
+    "dashboard",
+    ttl=settings.dashboard_cache_ttl_seconds,
+    stale_ttl=settings.dashboard_cache_stale_seconds,
+)
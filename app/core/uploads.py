@@ -0,0 +1,192 @@
+# app/core/uploads.py
+"""
+Content-addressed storage for uploaded images.
+
+Uploads are written in chunks to a temp file while being hashed, then
+renamed to `<root>/<h[:2]>/<h[2:4]>/<sha256><ext>`. Identical images share
+one file and names can't collide.
+
+`receive_upload_form` parses a multipart body straight off the request
+stream rather than letting Starlette spool it first (which writes parts over
+1 MiB to a temp file before the handler runs). So a request can be rejected
+before any of the file reaches disk, and the size limit applies to the bytes
+as they arrive: a declared Content-Length over the limit is refused without
+reading the body.
+"""
+import hashlib
+import os
+import re
+import tempfile
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from python_multipart.multipart import MultipartParseError, MultipartParser, parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+CHUNK_SIZE = 256 * 1024
+# Largest text field in an upload form (Starlette's own default part limit)
+MAX_FIELD_BYTES = 1024 * 1024
+_SAFE_EXT = re.compile(r"^\.[a-z0-9]{1,8}$")
+# Route name of the static mount serving UPLOAD_DIR
+UPLOADS_MOUNT = "uploads"
+
+
+def _extension(filename: str) -> str:
+    ext = os.path.splitext(filename or "")[1].lower()
+    return ext if _SAFE_EXT.match(ext) else ""
+
+
+def _finalize(tmp_path: str, final_path: str) -> None:
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    if os.path.exists(final_path):
+        os.unlink(tmp_path)  # same content already stored
+    else:
+        os.replace(tmp_path, final_path)
+
+
+def upload_url_root(request: Request) -> str:
+    """Public URL of UPLOAD_DIR, without a trailing slash; stored paths go after it."""
+    return str(request.url_for(UPLOADS_MOUNT, path="")).rstrip("/")
+
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=detail)
+
+
+class _HashedTempFile:
+    """A temp file under `root` that hashes what is written and stops at `max_bytes`."""
+
+    def __init__(self, root: str, max_bytes: int):
+        os.makedirs(root, exist_ok=True)
+        self.root = root
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._buffer = bytearray()
+        fd, self._path = tempfile.mkstemp(dir=root, prefix=".upload-")
+        self._file = os.fdopen(fd, "wb")
+
+    async def write(self, data: bytes) -> None:
+        self.size += len(data)
+        if self.size > self.max_bytes:
+            raise _too_large(f"Image exceeds the {self.max_bytes} byte limit")
+        self._digest.update(data)
+        self._buffer += data
+        if len(self._buffer) >= CHUNK_SIZE:
+            await self._flush()
+
+    async def _flush(self) -> None:
+        chunk, self._buffer = bytes(self._buffer), bytearray()
+        await run_in_threadpool(self._file.write, chunk)
+
+    async def store(self, filename: Optional[str]) -> str:
+        """Move into content-addressed storage; returns the path relative to `root`."""
+        await self._flush()
+        await run_in_threadpool(self._file.close)
+        name = self._digest.hexdigest()
+        relative = os.path.join(name[:2], name[2:4], name + _extension(filename))
+        await run_in_threadpool(_finalize, self._path, os.path.join(self.root, relative))
+        return relative.replace(os.sep, "/")
+
+    def discard(self) -> None:
+        self._file.close()
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+
+
+async def receive_upload_form(
+    request: Request,
+    file_field: str,
+    before_file: Callable[[Dict[str, str]], Awaitable[None]],
+    root: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    max_field_bytes: int = MAX_FIELD_BYTES,
+) -> Tuple[Dict[str, str], Optional[str]]:
+    """
+    Parse a multipart/form-data request body as it streams in.
+
+    Text fields are collected, each at most `max_field_bytes`. When the
+    `file_field` part begins, `before_file` is awaited with the fields seen
+    so far and may raise to refuse the request before a byte of the file is
+    written; the file then goes straight into content-addressed storage.
+    413 is raised on the Content-Length alone, or as soon as the file passes
+    `max_bytes` or the body `max_bytes + max_field_bytes`. Other file parts
+    are read and dropped. Returns (fields, stored path or None). `root` and
+    `max_bytes` default to UPLOAD_DIR and UPLOAD_MAX_BYTES.
+    """
+    root = root or settings.upload_dir
+    max_bytes = max_bytes or settings.upload_max_bytes
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Send multipart/form-data")
+    body_limit = max_bytes + max_field_bytes
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > body_limit:
+        raise _too_large(f"Request body exceeds the {body_limit} byte limit")
+
+    # The parser is push-based with sync callbacks; they only record events,
+    # which are handled (with awaits for the disk writes) after each chunk.
+    events: List[Tuple[str, Any]] = []
+    header_field, header_value, headers = bytearray(), bytearray(), {}
+
+    def on_header_end() -> None:
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished() -> None:
+        events.append(("part", parse_options_header(headers.pop(b"content-disposition", b""))[1]))
+        headers.clear()
+
+    parser = MultipartParser(options[b"boundary"], {
+        "on_header_field": lambda data, start, end: header_field.extend(data[start:end]),
+        "on_header_value": lambda data, start, end: header_value.extend(data[start:end]),
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": lambda data, start, end: events.append(("data", data[start:end])),
+        "on_part_end": lambda: events.append(("end", None)),
+    })
+
+    fields: Dict[str, str] = {}
+    stored: Optional[str] = None
+    sink: Optional[_HashedTempFile] = None
+    name, filename, text, received = "", None, None, 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > body_limit:
+                raise _too_large(f"Request body exceeds the {body_limit} byte limit")
+            parser.write(chunk)
+            for kind, value in events:
+                if kind == "part":
+                    name = value.get(b"name", b"").decode()
+                    filename = value.get(b"filename")
+                    text = bytearray() if filename is None else None
+                    if filename is not None and name == file_field and stored is None:
+                        await before_file(dict(fields))
+                        sink = _HashedTempFile(root, max_bytes)
+                elif kind == "data":
+                    if sink is not None:
+                        await sink.write(value)
+                    elif text is not None:
+                        text += value
+                        if len(text) > max_field_bytes:
+                            raise _too_large(f"Field '{name}' exceeds the {max_field_bytes} byte limit")
+                elif sink is not None:
+                    stored, sink = await sink.store(filename.decode(errors="replace")), None
+                elif text is not None:
+                    fields[name], text = text.decode(), None
+            events.clear()
+        parser.finalize()
+        if sink is not None or text is not None:
+            raise MultipartParseError("body ended inside a part")
+    except (MultipartParseError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed multipart body")
+    finally:
+        if sink is not None:
+            sink.discard()
+    return fields, stored
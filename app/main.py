@@ -1,34 +1,119 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from app.core.config import get_settings
-from app.models.base import Base, engine
+from app.core.dependencies import db_session_scope
+from app.core import image_variants
+from app.core.contact_queue import contact_queue
+from app.core.password_pool import password_pool
+from app.core.rate_limit import RateLimitMiddleware, load_backend
+from app.core.request_metrics import MetricsMiddleware
+from app.core.sql_profiler import SQLProfilerMiddleware
+from app.core.static_files import CachedStaticFiles
+from app.core.revocation import revoked_tokens
+from app.core.stats_counters import read_counters, run_reconciler
+from app.core.token_sweeper import run_sweeper
+from app.core.uploads import UPLOADS_MOUNT
+from app.core.ttl_cache import dashboard_cache
+from app.models.base import dispose_engines
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-
-from app.routers import dashboard, faqs, users , blogs , contacts
-
-settings = get_settings()
-
-app = FastAPI(
-    title=settings.app_name,
-    debug=settings.debug,
-)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# This creates all the tables in the database based on the models defined
-Base.metadata.create_all(bind=engine)
-
-app.include_router(users.router)
-app.include_router(blogs.router)
-app.include_router(faqs.router)
-app.include_router(contacts.router)
-app.include_router(dashboard.router) 
-app.mount("/static", StaticFiles(directory="static"), name="static")
+
+from app.routers import dashboard, faqs, users , blogs , contacts, metrics
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    # First DB use: this is where the engine and its pool get built
+    async with db_session_scope() as db:
+        await revoked_tokens.load(db)
+        await read_counters(db)  # creates the counters row if it is missing
+
+    if settings.contact_write_behind:
+        contact_queue.start()
+    background = []
+    if settings.token_sweep_interval_seconds > 0:
+        background.append(asyncio.create_task(
+            run_sweeper(settings.token_sweep_interval_seconds, settings.token_sweep_batch_size)
+        ))
+    if settings.stats_reconcile_interval_seconds > 0:
+        background.append(asyncio.create_task(
+            run_reconciler(settings.stats_reconcile_interval_seconds)
+        ))
+    yield
+    # Before anything the flusher needs (sessions, engines) goes away
+    await contact_queue.shutdown()
+    for task in background:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await dashboard_cache.shutdown()
+    password_pool.shutdown()
+    await image_variants.shutdown()
+    await dispose_engines()
+
+def create_app() -> FastAPI:
+    """
+    Build the application. Nothing here touches the database: engines are
+    created on first use and the schema is managed by Alembic
+    (`alembic upgrade head`).
+    """
+    settings = get_settings()
+
+    if settings.sentry_dsn:
+        import sentry_sdk
+
+        sentry_sdk.init(
+            dsn=settings.sentry_dsn,
+            environment=settings.sentry_environment,
+            traces_sample_rate=settings.sentry_traces_sample_rate,
+        )
+
+    app = FastAPI(
+        title=settings.app_name,
+        debug=settings.debug,
+        lifespan=lifespan,
+        # response_model output is already JSON-ready; orjson encodes it natively
+        default_response_class=ORJSONResponse,
+    )
+    # Inside CORS, so browsers can read 429/503 answers from the public forms
+    app.add_middleware(
+        RateLimitMiddleware,
+        rules=settings.rate_limits,
+        backend=load_backend(settings.rate_limit_backend, settings.rate_limit_max_keys),
+        max_concurrent=settings.max_concurrent_requests,
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:3000",
+            "http://127.0.0.1:3000",
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
+    )
+    sql_profile = settings.debug if settings.sql_profile is None else settings.sql_profile
+    if sql_profile:
+        app.add_middleware(SQLProfilerMiddleware, repeat_threshold=settings.sql_profile_repeat_threshold)
+    # Outermost, so its latency covers the whole middleware stack
+    app.add_middleware(MetricsMiddleware)
+
+    app.include_router(users.router)
+    app.include_router(blogs.router)
+    app.include_router(faqs.router)
+    app.include_router(contacts.router)
+    app.include_router(dashboard.router)
+    app.include_router(metrics.router)
+    # UPLOAD_DIR is served wherever it lives; mounted first so it wins over /static
+    os.makedirs(settings.upload_dir, exist_ok=True)
+    app.mount("/static/images", CachedStaticFiles(directory=settings.upload_dir, max_age=settings.static_max_age),
+              name=UPLOADS_MOUNT)
+    app.mount("/static", CachedStaticFiles(directory="static", max_age=settings.static_max_age), name="static")
+    return app
+
+# `uvicorn app.main:app`, or `uvicorn --factory app.main:create_app`
+app = create_app()
@@ -1,8 +1,168 @@
-from sqlalchemy.orm import declarative_base, sessionmaker
+from typing import Optional
+
+from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from starlette.concurrency import run_in_threadpool
 from app.core.config import get_settings
+from app.core.db_pool import engine_options, instrument_engine
+from app.core.request_metrics import track_db_time
 
-settings = get_settings()
 Base = declarative_base()
-engine = create_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async drivers used when DB_ASYNC is on and no ASYNC_DATABASE_URL is given
+_ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(database_url: str) -> URL:
+    url = make_url(database_url)
+    driver = _ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f"No async driver configured for '{url.get_backend_name()}'")
+    return url.set(drivername=driver)
+
+# Engines and sessionmakers are built on first use rather than at import, so
+# importing the app (workers, tests, Alembic) never needs a reachable database.
+_engine: Optional[Engine] = None
+_session_factory: Optional[sessionmaker] = None
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        database_url = get_settings().database_url
+        _engine = create_engine(database_url, **engine_options(database_url, "sync"))
+        instrument_engine(_engine, "sync")
+        track_db_time(_engine)
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker:
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+    return _session_factory
+
+
+def get_async_engine() -> Optional[AsyncEngine]:
+    """The async engine, or None when DB_ASYNC is off."""
+    global _async_engine
+    settings = get_settings()
+    if _async_engine is None and settings.db_async:
+        url = settings.async_database_url or to_async_url(settings.database_url)
+        _async_engine = create_async_engine(url, **engine_options(url, "async", is_async=True))
+        instrument_engine(_async_engine.sync_engine, "async")
+        track_db_time(_async_engine.sync_engine)
+    return _async_engine
+
+
+def get_async_sessionmaker() -> Optional[async_sessionmaker]:
+    global _async_session_factory
+    if _async_session_factory is None and get_async_engine() is not None:
+        # expire_on_commit=False: attributes must stay readable after commit,
+        # async sessions can't lazy-load them back in.
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+def sync_engine_for_events() -> Engine:
+    """The Engine the app's statements actually run on, for event listeners."""
+    async_engine = get_async_engine()
+    return async_engine.sync_engine if async_engine is not None else get_engine()
+
+
+async def dispose_engines() -> None:
+    """Close pooled connections of whichever engines were built."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+
+class ThreadedSession:
+    """
+    Awaitable facade over a sync Session (the DB_ASYNC=false path).
+
+    Exposes the subset of the AsyncSession API the routers use, so handlers are
+    written once; every blocking call is pushed to the threadpool.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    def add_all(self, instances) -> None:
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, *args, **kwargs):
+        # Buffer rows in the worker thread, like AsyncSession does
+        statement = statement.execution_options(prebuffer_rows=True)
+        return await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def stream(self, statement, *args, **kwargs) -> "ThreadedStreamResult":
+        # Unbuffered, like AsyncSession.stream: rows are fetched as they are consumed
+        statement = statement.execution_options(stream_results=True)
+        result = await run_in_threadpool(self.sync_session.execute, statement, *args, **kwargs)
+        return ThreadedStreamResult(result)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        result = await self.execute(statement, *args, **kwargs)
+        return result.scalars()
+
+    async def get(self, entity, ident, **kwargs):
+        return await run_in_threadpool(self.sync_session.get, entity, ident, **kwargs)
+
+    async def delete(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def refresh(self, instance, *args, **kwargs) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance, *args, **kwargs)
+
+    def get_bind(self, *args, **kwargs):
+        return self.sync_session.get_bind(*args, **kwargs)
+
+    async def flush(self) -> None:
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def close(self) -> None:
+        if not self.sync_session.in_transaction():
+            # Never used, or already committed: nothing to release, skip the hop
+            self.sync_session.close()
+            return
+        await run_in_threadpool(self.sync_session.close)
+
+
+class ThreadedStreamResult:
+    """The part of AsyncResult that ThreadedSession.stream callers use."""
+
+    def __init__(self, result):
+        self._result = result
+
+    def scalars(self) -> "ThreadedStreamResult":
+        return ThreadedStreamResult(self._result.scalars())
+
+    async def partitions(self, size: Optional[int] = None):
+        partitions = self._result.partitions(size)
+        while True:
+            partition = await run_in_threadpool(next, partitions, None)
+            if partition is None:
+                return
+            yield partition
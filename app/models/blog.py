@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, JSON
 from sqlalchemy.orm import relationship
 from app.models.base import Base
 
@@ -9,6 +9,7 @@ class Blog(Base):
     title = Column(String(255), index=True, unique=True, nullable=False)
     content = Column(Text, nullable=True)                         # Full content
     image = Column(String(255), nullable=True)                    # Optional image URL
+    image_srcset = Column(JSON, nullable=True)                    # {mime: srcset}, filled in the background
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)  # Author ID
 
     # Relationship with User
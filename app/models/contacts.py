@@ -1,6 +1,6 @@
 # app/models.py
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Index, DDL, column, event, table
 from sqlalchemy.orm import declarative_base
 import enum
 from app.models.base import Base
@@ -22,6 +22,49 @@ class ContactMessage(Base):
     preferred_time = Column(String(40), nullable=True)     
     message = Column(Text, nullable=True)
 
+    # Public id handed out at submission, before the row exists when the
+    # write-behind queue is on (see app/core/contact_queue.py)
+    reference = Column(String(32), nullable=True, unique=True, index=True)
+
     # triage + audit
     status = Column(Enum(ContactStatus), nullable=False, default=ContactStatus.new)
     created_at = Column(DateTime, nullable=False, default=datetime.now)
+
+# Keyset pagination: newest-first pages seek on (created_at, id), optionally
+# within one status
+Index("ix_contact_messages_created_at_id", ContactMessage.created_at, ContactMessage.id)
+Index("ix_contact_messages_status_created_at_id", ContactMessage.status, ContactMessage.created_at, ContactMessage.id)
+
+# --- Search backends for the `q` filter --------------------------------------
+# Postgres: one multicolumn pg_trgm GIN index serves the ILIKE '%term%' ORs.
+# SQLite: an FTS5 trigram shadow table, kept in sync by triggers.
+CONTACT_SEARCH_DDL = {
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_contact_messages_search_trgm ON contact_messages "
+        "USING gin (name gin_trgm_ops, email gin_trgm_ops, phone gin_trgm_ops, service gin_trgm_ops)",
+    ],
+    "sqlite": [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS contact_messages_fts USING fts5("
+        "name, email, phone, service, content='contact_messages', content_rowid='id', tokenize='trigram')",
+        "CREATE TRIGGER IF NOT EXISTS contact_messages_fts_ai AFTER INSERT ON contact_messages BEGIN "
+        "INSERT INTO contact_messages_fts(rowid, name, email, phone, service) "
+        "VALUES (new.id, new.name, new.email, new.phone, new.service); END",
+        "CREATE TRIGGER IF NOT EXISTS contact_messages_fts_ad AFTER DELETE ON contact_messages BEGIN "
+        "INSERT INTO contact_messages_fts(contact_messages_fts, rowid, name, email, phone, service) "
+        "VALUES ('delete', old.id, old.name, old.email, old.phone, old.service); END",
+        "CREATE TRIGGER IF NOT EXISTS contact_messages_fts_au AFTER UPDATE OF name, email, phone, service "
+        "ON contact_messages BEGIN "
+        "INSERT INTO contact_messages_fts(contact_messages_fts, rowid, name, email, phone, service) "
+        "VALUES ('delete', old.id, old.name, old.email, old.phone, old.service); "
+        "INSERT INTO contact_messages_fts(rowid, name, email, phone, service) "
+        "VALUES (new.id, new.name, new.email, new.phone, new.service); END",
+    ],
+}
+
+for _dialect, _statements in CONTACT_SEARCH_DDL.items():
+    for _ddl in _statements:
+        event.listen(ContactMessage.__table__, "after_create", DDL(_ddl).execute_if(dialect=_dialect))
+
+# Query handle for the SQLite shadow table (rank = bm25, lower is better)
+contact_messages_fts = table("contact_messages_fts", column("rowid"), column("rank"))
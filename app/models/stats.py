@@ -0,0 +1,19 @@
+from sqlalchemy import BigInteger, Column, Integer
+from app.models.base import Base
+
+# The one row of stats_counters
+STATS_ROW_ID = 1
+
+class StatsCounters(Base):
+    """
+    Denormalized totals for /dashboard/stats. Write paths bump these in the
+    same transaction as the row they add or remove; app.core.stats_counters
+    recomputes them exactly.
+    """
+    __tablename__ = "stats_counters"
+
+    id = Column(Integer, primary_key=True)
+    users = Column(BigInteger, nullable=False, default=0)
+    blogs = Column(BigInteger, nullable=False, default=0)
+    messages = Column(BigInteger, nullable=False, default=0)
+    new_messages = Column(BigInteger, nullable=False, default=0)
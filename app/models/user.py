@@ -20,7 +20,7 @@ class RevokedToken(Base):
     jti = Column(String(64), nullable=False, unique=True, index=True)  # JWT ID
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     token_type = Column(String(20), nullable=False, default="access")  # e.g., 'access'/'refresh'
-    revoked_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    revoked_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False)
 
     user = relationship("User")
@@ -1,62 +1,116 @@
-import os
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException , status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException , Query, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from typing import List
+from typing import List, Optional
 
+from app.core.config import get_settings
 from app.core.dependencies import get_db_session, get_current_user
+from app.core.identity_cache import CurrentUser
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.response_cache import response_cache
+from app.core.stats_counters import bump_counters
+from app.core.image_variants import schedule_variants
+from app.core.uploads import receive_upload_form, upload_url_root
 from app.models.blog import Blog
 from app.models.user import User
 from app.schemas.blog import BlogCreate, BlogResponse, BlogUpdate
-import shutil
 
 router = APIRouter(prefix="/blogs", tags=["blogs"])
+settings = get_settings()
+
+blog_list_adapter = TypeAdapter(List[BlogResponse])
+
+
+def _blog_columns(include_content: bool):
+    """
+    BlogResponse fields as plain columns: rows validate as small dicts, with
+    no ORM instance state to copy or walk.
+    """
+    columns = [Blog.id, Blog.title, Blog.image, Blog.image_srcset, Blog.owner_id, User.username.label("author")]
+    if include_content:
+        columns.append(Blog.content)
+    return columns
 
 ### CRUD Operations ###
 
-@router.post("/", response_model=BlogResponse)
-def create_blog(
-    title: str = Form(...),
-    content: str = Form(...),
-    image: UploadFile = File(...),
-    db: Session = Depends(get_db_session),
+@router.post(
+    "/",
+    response_model=BlogResponse,
+    openapi_extra={"requestBody": {"required": True, "content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "required": ["title", "content", "image"],
+        "properties": {
+            "title": {"type": "string"},
+            "content": {"type": "string"},
+            "image": {"type": "string", "format": "binary"},
+        },
+    }}}}},
+)
+async def create_blog(
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
     current_user = Depends(get_current_user),
 ):
+    """
+    Multipart form with `title`, `content` and an `image` file.
+
+    The body is parsed as it arrives, not spooled first: a taken title is
+    refused before any of the image is written, provided `title` comes
+    before `image` in the form (as browsers send it), and UPLOAD_MAX_BYTES
+    is enforced on the incoming stream.
+    """
+    title_checked = False
+
+    async def ensure_new_title(fields):
+        nonlocal title_checked
+        if "title" in fields:
+            title_checked = True
+            if await db.scalar(select(Blog.id).where(Blog.title == fields["title"])):
+                await db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"A blog with the title '{fields['title']}' already exists."
+                )
+
     try:
-        os.makedirs("static/images", exist_ok=True)
-
-        # Save file
-        file_location = f"static/images/{image.filename}"
-        with open(file_location, "wb") as f:
-            shutil.copyfileobj(image.file, f)
-
-        # Build a public URL (see #3 below to mount /static)
-        base_url = "http://127.0.0.1:8000"
-        image_url = f"{base_url}/{file_location}" 
-
-        # Uniqueness check
-        existing_blog = db.query(Blog).filter(Blog.title == title).first()
-        if existing_blog:
-            db.rollback()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"A blog with the title '{title}' already exists."
-            )
-
-        blog = Blog(title=title, content=content, image=image_url, owner=current_user)
+        # Save file (streamed, content-addressed, size-capped)
+        fields, stored = await receive_upload_form(request, "image", before_file=ensure_new_title)
+        missing = [name for name in ("title", "content") if name not in fields] + ([] if stored else ["image"])
+        if missing:
+            raise RequestValidationError([
+                {"type": "missing", "loc": ("body", name), "msg": "Field required", "input": None}
+                for name in missing
+            ])
+        title, content = fields["title"], fields["content"]
+        if not title_checked:
+            # The title came after the image; the stored file stays as an orphan
+            await ensure_new_title(fields)
+        url_root = upload_url_root(request)
+        image_url = f"{url_root}/{stored}"
+
+        blog = Blog(title=title, content=content, image=image_url, owner_id=current_user.id)
         db.add(blog)
-        db.commit()
-        db.refresh(blog)
+        await bump_counters(db, blogs=1)
+        await db.commit()
+        await db.refresh(blog)
+        response_cache.invalidate("blogs")
+        # Thumbnails / WebP are generated after the response is sent
+        schedule_variants(blog.id, settings.upload_dir, stored, url_root)
         return blog
 
+    except (HTTPException, RequestValidationError):
+        raise
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"A blog with the title '{title}' already exists."
         )
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating blog: {str(e)}"
@@ -64,47 +118,74 @@ def create_blog(
 
 # Get all blogs (GET /blogs/)
 @router.get("/", response_model=List[BlogResponse])
-def get_all_blogs(db: Session = Depends(get_db_session)):
-    blogs = db.query(Blog).all()
-    blog_list = []
-    for blog in blogs:
-        author = None
-        if hasattr(blog, 'owner') and blog.owner:
-            author = blog.owner.username
-        else:
-            # Fallback: fetch user from User model if relationship not set up
-            user = db.query(User).filter(User.id == blog.owner_id).first()
-            author = user.username if user else None
-        blog_dict = blog.__dict__.copy()
-        blog_dict['author'] = author
-        blog_list.append(blog_dict)
-    return blog_list
+async def get_all_blogs(
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_content: bool = Query(False, description="Include the full post body"),
+):
+    """
+    Newest first, one query: authors are joined in and `content` is only
+    selected when asked for. When more posts exist, the cursor for the next
+    page is returned in the `X-Next-Cursor` header.
+    """
+    cached = response_cache.get(request)
+    if cached is not None:
+        return cached
+
+    stmt = (
+        select(*_blog_columns(include_content))
+        .outerjoin(User, User.id == Blog.owner_id)
+        .order_by(Blog.id.desc())
+        .limit(limit + 1)
+    )
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        if not isinstance(last_id, int):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        stmt = stmt.where(Blog.id < last_id)
+
+    result = await db.execute(stmt)
+    keys, rows = list(result.keys()), result.all()
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(rows[-1].id)
+    body = blog_list_adapter.dump_json(blog_list_adapter.validate_python([dict(zip(keys, row)) for row in rows]))
+    return response_cache.store(request, body, tags=("blogs",), headers=headers)
 
 # app/routers/blogs.py (or wherever your router is)
 @router.get("/blog-id/{blog_id}", response_model=BlogResponse)
-def get_blog(
+async def get_blog(
     blog_id: int,
-    db: Session = Depends(get_db_session)
+    request: Request,
+    db: AsyncSession = Depends(get_db_session)
 ):
-    blog = db.query(Blog).filter(Blog.id == blog_id).first()
-    if not blog:
+    cached = response_cache.get(request)
+    if cached is not None:
+        return cached
+    row = (await db.execute(
+        select(*_blog_columns(include_content=True))
+        .outerjoin(User, User.id == Blog.owner_id)
+        .where(Blog.id == blog_id)
+    )).first()
+    if row is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blog not found")
 
-    author = blog.owner.username if blog.owner else None
-    blog_dict = blog.__dict__.copy()
-    blog_dict["author"] = author
-    return blog_dict
+    body = BlogResponse.model_validate(row._asdict()).model_dump_json().encode()
+    return response_cache.store(request, body, tags=(f"blog:{blog_id}",))
 
 
 # Update a blog post (PUT /blogs/{blog_id})
 @router.put("/update/{blog_id}", response_model=BlogResponse)
-def update_blog(
+async def update_blog(
     blog_id: int,
     blog_update: BlogUpdate,
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    db_blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    db_blog = await db.get(Blog, blog_id)
     if not db_blog:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blog not found")
 
@@ -117,21 +198,22 @@ def update_blog(
         if blog_update.content is not None:
             db_blog.content = blog_update.content
 
-        db.commit()
-        db.refresh(db_blog)
+        await db.commit()
+        await db.refresh(db_blog)
+        response_cache.invalidate("blogs", f"blog:{blog_id}")
         return db_blog
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 # Delete a blog post (DELETE /blogs/{blog_id})
 @router.delete("/delete/{blog_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_blog(
+async def delete_blog(
     blog_id: int,
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    db_blog = db.query(Blog).filter(Blog.id == blog_id).first()
+    db_blog = await db.get(Blog, blog_id)
     if not db_blog:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blog not found")
 
@@ -139,9 +221,11 @@ def delete_blog(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this blog")
 
     try:
-        db.delete(db_blog)
-        db.commit()
+        await db.delete(db_blog)
+        await bump_counters(db, blogs=-1)
+        await db.commit()
+        response_cache.invalidate("blogs", f"blog:{blog_id}")
         return {"detail": "Blog deleted successfully"}
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not delete blog")
\ No newline at end of file
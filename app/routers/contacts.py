@@ -1,90 +1,281 @@
 # app/routers/contacts.py
-from fastapi import APIRouter, Depends, HTTPException, Query, status, Response
-from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, literal_column, or_, text, tuple_
+from datetime import date, datetime
+from typing import Literal, Optional
 
-from app.core.dependencies import get_db_session
-from app.schemas.contacts import ContactCreate, ContactRead, ContactList, ContactStatus
-from app.models.contacts import ContactMessage , ContactStatus
+from app.core.config import get_settings
+from app.core.contact_export import EXPORT_COLUMNS, MEDIA_TYPES, export_chunks
+from app.core.contact_queue import contact_queue
+from app.core.contact_import import FORMATS, contact_values, import_contacts, is_spam, iter_csv, iter_ndjson
+from app.core.dependencies import get_current_user, get_db_session
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.stats_counters import bump_counters
+from app.schemas.contacts import (
+    ContactCreate, ContactImportResult, ContactRead, ContactList, ContactQueued, ContactStatus,
+)
+from app.models.contacts import ContactMessage , ContactStatus, contact_messages_fts
 
 router = APIRouter(prefix="/contacts", tags=["contacts"])
+settings = get_settings()
 
-@router.post("/create", response_model=ContactRead, status_code=status.HTTP_201_CREATED)
-def create_contact(payload: ContactCreate, db: Session = Depends(get_db_session)):
+# count=estimate never counts past this many matching rows
+COUNT_ESTIMATE_CAP = 10_000
+
+# Newest-first search on SQLite: a term with at least this many FTS matches
+# is paged by walking the (created_at, id) index and testing each row, which
+# stops after a page; rarer terms use the FTS join, which sorts every match.
+FTS_WALK_MIN_MATCHES = 2000
+
+SEARCH_COLUMNS = (ContactMessage.name, ContactMessage.email, ContactMessage.phone, ContactMessage.service)
+
+@router.post(
+    "/create",
+    response_model=ContactRead,
+    status_code=status.HTTP_201_CREATED,
+    responses={202: {"model": ContactQueued, "description": "Queued (CONTACT_WRITE_BEHIND)"}},
+)
+async def create_contact(payload: ContactCreate, db: AsyncSession = Depends(get_db_session)):
     """
     Create a new contact message.
 
     - Honors honeypot (`website`): if filled, return 204 No Content (silently drop spam).
     - Validates phone/email via Pydantic.
+    - In write-behind mode, returns 202 with the message's future `reference`
+      and writes it in the next batch.
     """
     # Honeypot: bots often fill "website". If present, ignore the submission.
-    if getattr(payload, "website", None) and payload.website.strip():
+    if is_spam(payload):
         # 204 No Content is the clean way to indicate "handled, nothing to return".
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-    obj = ContactMessage(
-        name=payload.name.strip(),
-        email=payload.email,
-        phone=payload.phone,
-        service=(payload.service.strip() if payload.service else None),
-        preferred_time=payload.preferred_time,
-        message=(payload.message.strip() if payload.message else None),
-        status=ContactStatus.new,
-    )
+    values = contact_values(payload)
+    if settings.contact_write_behind:
+        await contact_queue.put(values)
+        return ORJSONResponse(
+            ContactQueued(id=values["reference"]).model_dump(), status_code=status.HTTP_202_ACCEPTED
+        )
+
+    obj = ContactMessage(**values)
     db.add(obj)
-    db.commit()
-    db.refresh(obj)
+    await bump_counters(db, messages=1, new_messages=1)
+    await db.commit()
+    await db.refresh(obj)
     return obj
 
 
+@router.post(
+    "/bulk",
+    response_model=ContactImportResult,
+    openapi_extra={"requestBody": {"required": True, "content": {
+        "application/x-ndjson": {"schema": {"type": "string", "description": "One ContactCreate object per line"}},
+        "text/csv": {"schema": {"type": "string", "description": "Header row of ContactCreate field names"}},
+    }}},
+)
+async def import_contacts_bulk(
+    request: Request,
+    db: AsyncSession = Depends(get_db_session),
+    current_user=Depends(get_current_user),
+):
+    """
+    Import many contact messages from a streamed NDJSON or CSV body.
+
+    Each row is validated like the public form. Valid rows are inserted in
+    batches, so rows before a failure stay imported; invalid rows are
+    reported by line number and honeypot rows are skipped.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if media_type not in FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=f"Send one of: {', '.join(FORMATS)}",
+        )
+    parse = iter_csv if FORMATS[media_type] == "csv" else iter_ndjson
+    try:
+        return await import_contacts(
+            db,
+            parse(request.stream(), settings.contact_import_max_record_length),
+            settings.contact_import_batch_size,
+            settings.contact_import_max_errors,
+        )
+    except UnicodeDecodeError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body is not valid UTF-8; batches before the bad bytes were imported",
+        )
+
+
 @router.get("", response_model=ContactList)
-def list_contacts(
-    db: Session = Depends(get_db_session),
+async def list_contacts(
+    db: AsyncSession = Depends(get_db_session),
     q: Optional[str] = Query(None, description="Search in name, email, phone, service"),
     status_filter: Optional[ContactStatus] = Query(None, alias="status"),
     offset: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="`next_cursor` of the previous page (replaces offset)"),
+    sort: Literal["newest", "relevance"] = Query("newest", description="relevance ranks `q` matches"),
+    count: Literal["exact", "estimate", "none"] = Query(
+        "exact", description="How to compute `total`: exact, estimate (bounded cost) or none"
+    ),
 ):
     """
     Get contacts with search + pagination.
-    Ordered by newest first.
+    Ordered by newest first (created_at, then id).
+
+    Pass `next_cursor` back as `cursor` to page by keyset: every page then
+    costs the same no matter how deep it is. `count=none` skips the total.
+    With `q` and `sort=relevance`, pages are ordered by search rank instead.
     """
-    stmt = select(ContactMessage)
-    if q:
-        like = f"%{q.strip()}%"
-        stmt = stmt.where(
-            (ContactMessage.name.ilike(like)) |
-            (ContactMessage.email.ilike(like)) |
-            (ContactMessage.phone.ilike(like)) |
-            (ContactMessage.service.ilike(like))
+    term = q.strip() if q else ""
+    dialect = db.get_bind().dialect.name
+
+    def build(backend: str):
+        stmt, rank = apply_search(select(ContactMessage), backend, term) if term else (select(ContactMessage), None)
+        if status_filter:
+            stmt = stmt.where(ContactMessage.status == status_filter)
+        return stmt, rank
+
+    stmt, rank = build(dialect)
+    if sort == "relevance" and rank is not None:
+        key = (rank, ContactMessage.id)
+        page = stmt.add_columns(rank).order_by(rank.desc(), ContactMessage.id.desc())
+    else:
+        key = (ContactMessage.created_at, ContactMessage.id)
+        # A common term makes the FTS join sort every match; filtering rows
+        # while walking the (created_at, id) index finds a page sooner
+        pages_from = stmt
+        if dialect == "sqlite" and rank is not None:
+            if await db.scalar(fts_match_probe(term)) >= FTS_WALK_MIN_MATCHES:
+                pages_from, _ = build("generic")
+        page = pages_from.add_columns(ContactMessage.created_at).order_by(
+            ContactMessage.created_at.desc(), ContactMessage.id.desc()
         )
-    if status_filter:
-        stmt = stmt.where(ContactMessage.status == status_filter)
 
-    total = db.scalar(select(func.count()).select_from(stmt.subquery()))
-    items = db.execute(
-        stmt.order_by(ContactMessage.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-    ).scalars().all()
+    if cursor:
+        first, last_id = decode_cursor(cursor, 2)
+        try:
+            first = float(first) if key[0] is rank else datetime.fromisoformat(first)
+            after = (first, int(last_id))
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+        page = page.where(tuple_(*key) < after)
+    else:
+        page = page.offset(offset)
+
+    # One extra row tells us whether another page exists
+    rows = (await db.execute(page.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    items = [row[0] for row in rows]
+    next_cursor = encode_cursor(rows[-1][1], rows[-1][0].id) if has_more else None
+
+    total = None
+    if count != "none":
+        total = await _count_contacts(db, stmt, estimate=(count == "estimate"), filtered=bool(q or status_filter))
+
+    return {"total": total, "items": items, "next_cursor": next_cursor, "has_more": has_more}
+
 
-    return {"total": total or 0, "items": items}
+@router.get("/export", response_class=StreamingResponse, responses={
+    200: {"content": {"text/csv": {}, "application/x-ndjson": {}}, "description": "The matching contacts"},
+})
+async def export_contacts(
+    q: Optional[str] = Query(None, description="Search in name, email, phone, service"),
+    status_filter: Optional[ContactStatus] = Query(None, alias="status"),
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    current_user=Depends(get_current_user),
+):
+    """
+    Every contact matching `q` / `status` (as in the list), oldest first,
+    streamed as CSV with a header row or as NDJSON. No count is run and
+    rows are read in batches, so exports of any size use the same memory.
+    """
+    term = q.strip() if q else None
+
+    def build(dialect: str):
+        stmt = select(*EXPORT_COLUMNS)
+        if term:
+            stmt, _ = apply_search(stmt, dialect, term)
+        if status_filter:
+            stmt = stmt.where(ContactMessage.status == status_filter)
+        return stmt.order_by(ContactMessage.id)
+
+    filename = f"contacts-{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        export_chunks(build, format, settings.contact_export_batch_size),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def apply_search(stmt, dialect: str, term: str):
+    """
+    Apply the `q` filter using the dialect's search index.
+    Returns (stmt, rank); rank is a higher-is-better score, or None when the
+    backend can't score matches (other dialects, or terms too short for
+    SQLite's trigram index).
+    """
+    if dialect == "sqlite" and len(term) >= 3:
+        stmt = stmt.join(
+            contact_messages_fts, contact_messages_fts.c.rowid == ContactMessage.id
+        ).where(_fts_match(term))
+        return stmt, (-contact_messages_fts.c.rank).label("rank")
+
+    # Escaped, so % and _ are literal as they are in the FTS phrase
+    stmt = stmt.where(or_(*(col.icontains(term, autoescape=True) for col in SEARCH_COLUMNS)))
+    if dialect == "postgresql":
+        rank = func.greatest(*(func.word_similarity(term, col) for col in SEARCH_COLUMNS))
+        return stmt, rank.label("rank")
+    return stmt, None
+
+
+def _fts_match(term: str):
+    # One quoted phrase: FTS5 operators and syntax in `term` are plain text
+    phrase = '"' + term.replace('"', '""') + '"'
+    return literal_column("contact_messages_fts").op("MATCH")(phrase)
+
+
+def fts_match_probe(term: str):
+    """SQLite: how many rows match `term`, counting no further than FTS_WALK_MIN_MATCHES."""
+    matches = select(contact_messages_fts.c.rowid).where(_fts_match(term)).limit(FTS_WALK_MIN_MATCHES)
+    return select(func.count()).select_from(matches.subquery())
+
+
+async def _count_contacts(db: AsyncSession, stmt, estimate: bool, filtered: bool) -> int:
+    ids = stmt.with_only_columns(ContactMessage.id)
+    if not estimate:
+        return await db.scalar(select(func.count()).select_from(ids.subquery())) or 0
+
+    # Unfiltered on Postgres: the planner's row estimate, no scan at all
+    if not filtered and db.get_bind().dialect.name == "postgresql":
+        reltuples = await db.scalar(
+            text("SELECT reltuples::bigint FROM pg_class WHERE oid = 'contact_messages'::regclass")
+        )
+        if reltuples is not None and reltuples >= 0:
+            return reltuples
+    # Otherwise count at most COUNT_ESTIMATE_CAP rows
+    return await db.scalar(
+        select(func.count()).select_from(ids.limit(COUNT_ESTIMATE_CAP).subquery())
+    ) or 0
 
 
 @router.get("/{contact_id}", response_model=ContactRead)
-def get_contact(contact_id: int, db: Session = Depends(get_db_session)):
-    obj = db.get(ContactMessage, contact_id)
+async def get_contact(contact_id: int, db: AsyncSession = Depends(get_db_session)):
+    obj = await db.get(ContactMessage, contact_id)
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
     return obj
 
 
 @router.delete("/{contact_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_contact(contact_id: int, db: Session = Depends(get_db_session)):
-    obj = db.get(ContactMessage, contact_id)
+async def delete_contact(contact_id: int, db: AsyncSession = Depends(get_db_session)):
+    obj = await db.get(ContactMessage, contact_id)
     if not obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found")
-    db.delete(obj)
-    db.commit()
+    await db.delete(obj)
+    await bump_counters(db, messages=-1, new_messages=-1 if obj.status == ContactStatus.new else 0)
+    await db.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
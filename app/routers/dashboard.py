@@ -1,48 +1,52 @@
 # app/routers/dashboard.py
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.core.dependencies import get_db_session
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from app.core.dependencies import db_session_scope
 from app.core.dependencies import get_current_user
+from app.core.identity_cache import CurrentUser
+from app.core.stats_counters import read_counters
+from app.core.ttl_cache import dashboard_cache
 from app.models.contacts import ContactMessage
-from app.models.user import User
 from app.models.blog import Blog
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
-@router.get("/stats")
-def get_stats(
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user)
-):
-    total_users = db.query(User).count()
-    total_blogs = db.query(Blog).count()
-    total_messages = db.query(ContactMessage).count()
-    new_messages = db.query(ContactMessage).filter(ContactMessage.status == "new").count()
+# Results are the same for every admin, so they are computed once per TTL
+# (see app.core.ttl_cache); loaders open their own session for that reason.
+
+async def _load_stats():
+    async with db_session_scope() as db:
+        # Maintained by the write paths; see app.core.stats_counters
+        counters = await read_counters(db)
 
     return {
         "stats": [
-            {"title": "New Messages", "value": str(new_messages)},
-            {"title": "Total Patients", "value": str(total_users)},
-            {"title": "Blog Posts", "value": str(total_blogs)},
-            {"title": "All Messages", "value": str(total_messages)},
+            {"title": "New Messages", "value": str(counters["new_messages"])},
+            {"title": "Total Patients", "value": str(counters["users"])},
+            {"title": "Blog Posts", "value": str(counters["blogs"])},
+            {"title": "All Messages", "value": str(counters["messages"])},
         ]
     }
 
-@router.get("/recent-messages")
-def recent_messages(
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user)
-):
-    q = db.query(ContactMessage).order_by(ContactMessage.created_at.desc()).limit(5).all()
-    return {"messages": q}
+async def _load_recent_messages():
+    async with db_session_scope() as db:
+        q = (await db.scalars(select(ContactMessage).order_by(ContactMessage.created_at.desc()).limit(5))).all()
+        return jsonable_encoder({"messages": q})
 
-@router.get("/recent-blogs")
-def recent_blogs(
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user)
-):
-    q = db.query(Blog).order_by(Blog.id.desc()).limit(5).all()
-    return {"blogs": q}
+async def _load_recent_blogs():
+    async with db_session_scope() as db:
+        q = (await db.scalars(select(Blog).order_by(Blog.id.desc()).limit(5))).all()
+        return jsonable_encoder({"blogs": q})
 
+@router.get("/stats")
+async def get_stats(current_user: CurrentUser = Depends(get_current_user)):
+    return await dashboard_cache.get("stats", _load_stats)
 
+@router.get("/recent-messages")
+async def recent_messages(current_user: CurrentUser = Depends(get_current_user)):
+    return await dashboard_cache.get("recent-messages", _load_recent_messages)
 
+@router.get("/recent-blogs")
+async def recent_blogs(current_user: CurrentUser = Depends(get_current_user)):
+    return await dashboard_cache.get("recent-blogs", _load_recent_blogs)
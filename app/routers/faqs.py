@@ -1,57 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.core.dependencies import get_db_session, get_current_user
+from app.core.identity_cache import CurrentUser
+from app.core.response_cache import response_cache
 from app.models.faq import FAQ
-from app.models.user import User
 from app.schemas.faq import FAQCreate, FAQResponse, FAQUpdate
 
 router = APIRouter(prefix="/faqs", tags=["faqs"])
 
+faq_list_adapter = TypeAdapter(List[FAQResponse])
+
 # Get all FAQs
 @router.get("/", response_model=List[FAQResponse])
-def get_all_faqs(db: Session = Depends(get_db_session)):
-    faqs = db.query(FAQ).all()
-    return faqs
+async def get_all_faqs(request: Request, db: AsyncSession = Depends(get_db_session)):
+    cached = response_cache.get(request)
+    if cached is not None:
+        return cached
+    faqs = (await db.scalars(select(FAQ))).all()
+    body = faq_list_adapter.dump_json(faq_list_adapter.validate_python(faqs, from_attributes=True))
+    return response_cache.store(request, body, tags=("faqs",))
 
 # Get a specific FAQ by ID
 @router.get("/{faq_id}", response_model=FAQResponse)
-def get_faq(faq_id: int, db: Session = Depends(get_db_session)):
-    faq = db.query(FAQ).filter(FAQ.id == faq_id).first()
+async def get_faq(faq_id: int, request: Request, db: AsyncSession = Depends(get_db_session)):
+    cached = response_cache.get(request)
+    if cached is not None:
+        return cached
+    faq = await db.get(FAQ, faq_id)
     if not faq:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="FAQ not found")
-    return faq
+    body = FAQResponse.model_validate(faq).model_dump_json().encode()
+    return response_cache.store(request, body, tags=(f"faq:{faq_id}",))
 
 
 # Create a new FAQ
 @router.post("/", response_model=FAQResponse, status_code=status.HTTP_201_CREATED)
-def create_faq(
+async def create_faq(
     faq: FAQCreate,
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     try:
         new_faq = FAQ(question=faq.question, answer=faq.answer)
         db.add(new_faq)
-        db.commit()
-        db.refresh(new_faq)
+        await db.commit()
+        await db.refresh(new_faq)
+        response_cache.invalidate("faqs")
         return new_faq
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 
 # Update an existing FAQ
 @router.put("/{faq_id}", response_model=FAQResponse)
-def update_faq(
+async def update_faq(
     faq_id: int,
     faq_update: FAQUpdate,
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    db_faq = db.query(FAQ).filter(FAQ.id == faq_id).first()
+    db_faq = await db.get(FAQ, faq_id)
     if not db_faq:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="FAQ not found")
     
@@ -61,30 +75,32 @@ def update_faq(
         if faq_update.answer is not None:
             db_faq.answer = faq_update.answer
             
-        db.commit()
-        db.refresh(db_faq)
+        await db.commit()
+        await db.refresh(db_faq)
+        response_cache.invalidate("faqs", f"faq:{faq_id}")
         return db_faq
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 
 # Delete an FAQ
 @router.delete("/{faq_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_faq(
+async def delete_faq(
     faq_id: int,
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser = Depends(get_current_user)
 ):
-    db_faq = db.query(FAQ).filter(FAQ.id == faq_id).first()
+    db_faq = await db.get(FAQ, faq_id)
     if not db_faq:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="FAQ not found")
     
     try:
-        db.delete(db_faq)
-        db.commit()
+        await db.delete(db_faq)
+        await db.commit()
+        response_cache.invalidate("faqs", f"faq:{faq_id}")
     except Exception:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Could not delete FAQ")
     return None # Return None for 204 No Content
\ No newline at end of file
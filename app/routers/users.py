@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import time
 from datetime import datetime, timezone
-from sqlalchemy import or_
+from sqlalchemy import or_, select
 from app.models.user import RevokedToken
 from app.core.dependencies import oauth2_scheme 
 from app.core.dependencies import get_current_user, get_db_session
-from app.core.security import decode_access_token, get_password_hash, verify_password, create_access_token , hash_password
+from app.core.identity_cache import CurrentUser
+from app.core.revocation import revoked_tokens
+from app.core.stats_counters import bump_counters
+from app.core.metrics import Histogram
+from app.core.security import decode_access_token, get_password_hash_async, verify_password_async, create_access_token
 from app.models.user import User
 from app.schemas.auth import ChangePasswordIn
 from app.schemas.user import UserCreate, UserResponse
@@ -16,44 +21,63 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+login_latency = Histogram(
+    "login_duration_seconds",
+    "End-to-end /users/login handler time, including bcrypt queue wait.",
+    ("outcome",),
+)
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user: UserCreate, db: Session = Depends(get_db_session)):
-    db_user = db.query(User).filter(User.username == user.username or User.email == user.email).first()
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db_session)):
+    db_user = await db.scalar(
+        select(User).where(or_(User.username == user.username, User.email == user.email))
+    )
     if db_user:
         raise HTTPException(status_code=400, detail="Username or email already registered")
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     new_user = User(
         username=user.username,
         email=user.email,
         hashed_password=hashed_password,
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await bump_counters(db, users=1)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 @router.post("/login", tags=["authentication"])
-def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db_session)):
-    print(form_data.username , form_data.password)
-    user = db.query(User).filter(
-    or_(User.username == form_data.username, User.username == form_data.username)).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect username or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    access_token = create_access_token(data={"sub": user.username})
-    return {"access_token": access_token, "token_type": "bearer"}
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db_session)):
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        user = await db.scalar(select(User).where(
+        or_(User.username == form_data.username, User.username == form_data.username)))
+        if not user or not await verify_password_async(form_data.password, user.hashed_password):
+            outcome = "failure"
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Incorrect username or password",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        access_token = create_access_token(data={"sub": user.username})
+        outcome = "success"
+        return {"access_token": access_token, "token_type": "bearer"}
+    except HTTPException as exc:
+        if exc.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+            outcome = "shed"  # the bcrypt pool was full
+        raise
+    finally:
+        login_latency.observe(time.perf_counter() - started, outcome)
 
 
 
 @router.post("/logout", tags=["authentication"])
-def logout(
+async def logout(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     payload = decode_access_token(token)
     jti = payload.get("jti")
@@ -65,7 +89,7 @@ def logout(
 
     expires_at = datetime.fromtimestamp(exp, tz=timezone.utc)
 
-    exists = db.query(RevokedToken).filter(RevokedToken.jti == jti).first()
+    exists = await db.scalar(select(RevokedToken.id).where(RevokedToken.jti == jti))
     if not exists:
         db.add(RevokedToken(
             jti=jti,
@@ -74,23 +98,29 @@ def logout(
             revoked_at=datetime.now(tz=timezone.utc),
             expires_at=expires_at,
         ))
-        db.commit()
+        await db.commit()
+    revoked_tokens.add(jti, expires_at.timestamp())
 
     return {"detail": "Logged out successfully"}
 
 
 @router.post("/change-password", status_code=status.HTTP_204_NO_CONTENT)
-def change_password(
+async def change_password(
     payload: ChangePasswordIn,
-    db: Session = Depends(get_db_session),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db_session),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
+    # current_user is a read-only identity; the row to change comes from this session
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
+
     # 1) verify current password
-    if not verify_password(payload.current_password, current_user.hashed_password):
+    if not await verify_password_async(payload.current_password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Current password is incorrect")
 
     # 2) must be different from old
-    if verify_password(payload.new_password, current_user.hashed_password):
+    if await verify_password_async(payload.new_password, user.hashed_password):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New password must be different")
 
     # 3) (optional) strengthen policy
@@ -98,9 +128,8 @@ def change_password(
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="New password must be at least 8 characters")
 
     # 4) hash & save
-    current_user.hashed_password = hash_password(payload.new_password)
-    db.add(current_user)
-    db.commit()
+    user.hashed_password = await get_password_hash_async(payload.new_password)
+    await db.commit()  # also drops the cached identity (app/core/identity_cache.py)
     # (optional) revoke tokens here if you maintain a blacklist or token_version
     return  # 204
 
@@ -108,18 +137,18 @@ def change_password(
 
 ### Get Current User Endpoint (Protected) ###
 @router.get("/me", response_model=UserResponse)
-def read_current_user(current_user: User = Depends(get_current_user)):
+async def read_current_user(current_user: CurrentUser = Depends(get_current_user)):
     return current_user
 
 
 
 ### CRUD Endpoints (Protected) ###
 @router.get("/{user_id}", response_model=UserResponse)
-def read_user(user_id: int, db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
+async def read_user(user_id: int, db: AsyncSession = Depends(get_db_session), current_user: CurrentUser = Depends(get_current_user)):
     if current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to access this user's data")
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -127,14 +156,15 @@ def read_user(user_id: int, db: Session = Depends(get_db_session), current_user:
 
     
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(user_id: int, db: Session = Depends(get_db_session), current_user: User = Depends(get_current_user)):
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db_session), current_user: CurrentUser = Depends(get_current_user)):
     if current_user.id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this user")
     
-    db_user = db.query(User).filter(User.id == user_id).first()
+    db_user = await db.get(User, user_id)
     if not db_user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    db.delete(db_user)
-    db.commit()
-    return {"detail": "User deleted successfully"}
\ No newline at end of file
+    await db.delete(db_user)
+    await bump_counters(db, users=-1)
+    await db.commit()  # also drops the cached identity
+    return {"detail": "User deleted successfully"}
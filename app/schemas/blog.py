@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl
-from typing import Optional
+from typing import Dict, Optional
 
 # Shared properties
 class BlogBase(BaseModel):
@@ -23,6 +23,7 @@ class BlogResponse(BaseModel):
     title: str
     content: Optional[str] = None
     image: Optional[str] = None
+    image_srcset: Optional[Dict[str, str]] = None  # {"image/webp": "<url> 320w, ..."}
     owner_id: int
     author: Optional[str] = None  # <-- add this
 
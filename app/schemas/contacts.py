@@ -42,8 +42,9 @@ class ContactCreate(BaseModel):
 
 class ContactRead(BaseModel):
     id: int
+    reference: Optional[str] = None
     name: str
-    email: EmailStr
+    email: str  # validated on the way in; re-checking EmailStr dominated list serialization
     phone: str
     service: Optional[str]
     preferred_time: Optional[str]
@@ -54,6 +55,22 @@ class ContactRead(BaseModel):
     class Config:
         from_attributes = True
 
+class ContactQueued(BaseModel):
+    id: str  # becomes ContactRead.reference once the message is written
+    status: Literal["queued"] = "queued"
+
 class ContactList(BaseModel):
-    total: int
+    total: Optional[int] = None  # None when requested with count=none
     items: list[ContactRead]
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+class ContactImportError(BaseModel):
+    line: int  # first line of the record in the uploaded file
+    errors: list[str]
+
+class ContactImportResult(BaseModel):
+    inserted: int
+    skipped: int  # honeypot hits, dropped like the form does
+    failed: int
+    errors: list[ContactImportError]  # the first CONTACT_IMPORT_MAX_ERRORS of `failed`
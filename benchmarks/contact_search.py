@@ -0,0 +1,120 @@
+# benchmarks/contact_search.py
+"""
+Search latency for GET /contacts?q= with and without the search index.
+
+Seeds a scratch database with N contacts, then times the newest-first page
+as GET /contacts builds it (on SQLite: the FTS match probe, then the FTS
+join or the index walk it picks) against the FTS join alone and the plain
+ILIKE-scan fallback:
+
+    python -m benchmarks.contact_search --rows 1000000
+    python -m benchmarks.contact_search --database-url postgresql://... --rows 1000000
+
+Without --database-url a SQLite file under /tmp is used (FTS5 trigram).
+"""
+import argparse
+import os
+import random
+import statistics
+import string
+import time
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+parser.add_argument("--rows", type=int, default=1_000_000)
+parser.add_argument("--database-url", default="sqlite:////tmp/contact_search_bench.db")
+parser.add_argument("--repeat", type=int, default=20)
+parser.add_argument("--reseed", action="store_true", help="drop and reseed even if rows exist")
+args = parser.parse_args()
+
+# Settings are read at import time
+os.environ.setdefault("DATABASE_URL", args.database_url)
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ["DB_ASYNC"] = "false"
+
+from sqlalchemy import create_engine, func, insert, select  # noqa: E402
+
+from app.models.base import Base  # noqa: E402
+from app.models import blog, contacts, faq, user  # noqa: E402,F401
+from app.models.contacts import ContactMessage, ContactStatus  # noqa: E402
+from app.routers.contacts import FTS_WALK_MIN_MATCHES, apply_search, fts_match_probe  # noqa: E402
+
+SERVICES = ["bathroom remodel", "kitchen", "roofing", "plumbing", "painting", None]
+TERMS = ["smith", "remodel", "5550199", "gmail", "zzqx"]
+
+
+def seed(engine, rows: int) -> None:
+    rng = random.Random(42)
+    start = datetime(2024, 1, 1)
+    batch = []
+    with engine.begin() as conn:
+        for i in range(rows):
+            last = "".join(rng.choices(string.ascii_lowercase, k=7))
+            batch.append({
+                "name": f"{rng.choice(['John', 'Mary', 'Ana', 'Lee'])} {'smith' if i % 997 == 0 else last}",
+                "email": f"{last}{i}@{rng.choice(['gmail.com', 'example.org', 'mail.net'])}",
+                "phone": f"+1{rng.randrange(10**9, 10**10)}",
+                "service": rng.choice(SERVICES),
+                "status": ContactStatus.new,
+                "created_at": start + timedelta(seconds=i),
+            })
+            if len(batch) == 10_000:
+                conn.execute(insert(ContactMessage), batch)
+                batch.clear()
+        if batch:
+            conn.execute(insert(ContactMessage), batch)
+
+
+def newest_page(backend: str, term: str):
+    stmt, _ = apply_search(select(ContactMessage), backend, term)
+    return stmt.order_by(ContactMessage.created_at.desc(), ContactMessage.id.desc()).limit(20)
+
+
+def chosen_page(conn, dialect: str, term: str):
+    """The page query list_contacts runs, including its probe; returns the strategy used."""
+    if dialect == "sqlite" and len(term) >= 3:
+        walk = conn.scalar(fts_match_probe(term)) >= FTS_WALK_MIN_MATCHES
+        conn.execute(newest_page("generic" if walk else dialect, term)).all()
+        return "walk" if walk else "fts"
+    conn.execute(newest_page(dialect, term)).all()
+    return dialect
+
+
+def timed(run, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return "%7.2f / %7.2f" % (statistics.median(samples), max(samples))
+
+
+def main() -> None:
+    engine = create_engine(args.database_url)
+    if args.reseed:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        existing = conn.scalar(select(func.count()).select_from(ContactMessage))
+    if existing < args.rows:
+        print(f"seeding {args.rows - existing} rows ...")
+        started = time.perf_counter()
+        seed(engine, args.rows - existing)
+        print(f"seeded in {time.perf_counter() - started:.1f}s")
+
+    dialect = engine.dialect.name
+    print(f"{dialect}, {args.rows} rows, median/max ms over {args.repeat} runs (page of 20)")
+    print(f"{'term':<10} {'GET /contacts':>18} {'':<6} {'indexed only':>18} {'ilike scan':>18}")
+    with engine.connect() as conn:
+        for term in TERMS:
+            strategy = chosen_page(conn, dialect, term)
+            row = [timed(lambda: chosen_page(conn, dialect, term), args.repeat)]
+            for backend in (dialect, "generic"):
+                page = newest_page(backend, term)
+                row.append(timed(lambda: conn.execute(page).all(), args.repeat))
+            print(f"{term:<10} {row[0]:>18} {strategy:<6} {row[1]:>18} {row[2]:>18}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+# benchmarks/loadtest.py
+"""
+End-to-end load test: starts the app under uvicorn against a seeded
+database and drives a mixed workload over HTTP.
+
+Phases:
+  1. login burst     --login-burst concurrent logins at once (bcrypt pool)
+  2. mixed workload  --concurrency virtual users for --duration seconds:
+                     public blog/FAQ reads, contact-form posts, dashboard
+                     polling by logged-in admins and a trickle of logins
+
+Reports count, RPS, p50/p95/p99 and errors per endpoint template, and
+optionally compares with a stored baseline (exit status 1 on regression):
+
+    python -m benchmarks.loadtest --save-baseline benchmarks/loadtest_baseline.json
+    python -m benchmarks.loadtest --baseline benchmarks/loadtest_baseline.json
+    python -m benchmarks.loadtest --database-url postgresql://... --workers 4
+
+Without --database-url a SQLite file under /tmp is used. Seeding only runs
+when the database holds fewer rows than requested (or with --reseed).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+parser.add_argument("--database-url", default="sqlite:////tmp/loadtest.db")
+parser.add_argument("--db-async", default="true", choices=("true", "false"))
+parser.add_argument("--users", type=int, default=1_000)
+parser.add_argument("--blogs", type=int, default=500)
+parser.add_argument("--faqs", type=int, default=50)
+parser.add_argument("--contacts", type=int, default=50_000)
+parser.add_argument("--reseed", action="store_true", help="drop and reseed even if rows exist")
+parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+parser.add_argument("--port", type=int, default=8765)
+parser.add_argument("--login-burst", type=int, default=32)
+parser.add_argument("--concurrency", type=int, default=32)
+parser.add_argument("--duration", type=float, default=20.0, help="seconds of mixed workload")
+parser.add_argument("--seed", type=int, default=42)
+parser.add_argument("--output", help="write results JSON here")
+parser.add_argument("--save-baseline", metavar="PATH", help="write results as the new baseline")
+parser.add_argument("--baseline", metavar="PATH", help="compare with this baseline")
+parser.add_argument("--tolerance", type=float, default=0.25,
+                    help="allowed relative p95 increase / RPS drop before flagging (default 0.25)")
+args = parser.parse_args()
+
+# Settings are read at import time; the server subprocess inherits these too
+os.environ.setdefault("DATABASE_URL", args.database_url)
+os.environ.setdefault("SECRET_KEY", "loadtest")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ["DB_ASYNC"] = "false"  # seeding uses the sync engine
+
+import httpx  # noqa: E402
+from sqlalchemy import create_engine, delete, func, insert, select  # noqa: E402
+
+from app.core.security import get_password_hash  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models import faq, stats  # noqa: E402,F401
+from app.models.blog import Blog  # noqa: E402
+from app.models.contacts import ContactMessage, ContactStatus  # noqa: E402
+from app.models.faq import FAQ  # noqa: E402
+from app.models.stats import StatsCounters  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PASSWORD = "loadtest-password"
+OK = {200, 201, 204}
+# Share of mixed-phase iterations per scenario
+MIX = {"public_read": 60, "dashboard_poll": 25, "contact_submit": 10, "login": 5}
+
+
+# --- seeding ------------------------------------------------------------------
+
+def _insert(conn, model, rows):
+    for start in range(0, len(rows), 10_000):
+        conn.execute(insert(model), rows[start:start + 10_000])
+
+
+def seed(engine) -> None:
+    rng = random.Random(args.seed)
+    if args.reseed:
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        have = {m: conn.scalar(select(func.count()).select_from(m)) for m in (User, Blog, FAQ, ContactMessage)}
+    wanted = {User: args.users, Blog: args.blogs, FAQ: args.faqs, ContactMessage: args.contacts}
+    if all(have[m] >= n for m, n in wanted.items()):
+        return
+
+    print("seeding ...", flush=True)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    hashed = get_password_hash(PASSWORD)  # one bcrypt for every seeded user
+    started = datetime(2024, 1, 1)
+    paragraph = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 40
+    with engine.begin() as conn:
+        _insert(conn, User, [
+            {"username": f"user{i}", "email": f"user{i}@example.com", "hashed_password": hashed, "is_active": True}
+            for i in range(args.users)
+        ])
+        _insert(conn, Blog, [
+            {"title": f"Blog post {i}", "content": paragraph, "owner_id": rng.randrange(args.users) + 1,
+             "image": f"http://127.0.0.1:8000/static/images/{i:064x}.jpg"}
+            for i in range(args.blogs)
+        ])
+        _insert(conn, FAQ, [
+            {"question": f"Frequently asked question {i}?", "answer": paragraph[:400]}
+            for i in range(args.faqs)
+        ])
+        _insert(conn, ContactMessage, [
+            {"name": f"Visitor {i}", "email": f"visitor{i}@example.org", "phone": f"+1555{i:07d}",
+             "service": rng.choice(["kitchen", "roofing", "plumbing", None]),
+             "status": rng.choice(list(ContactStatus)), "created_at": started + timedelta(seconds=i)}
+            for i in range(args.contacts)
+        ])
+        # The server recounts on startup when the counters row is missing
+        conn.execute(delete(StatsCounters))
+
+
+# --- load generation ----------------------------------------------------------
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.shed: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[label] += 1
+            return None
+        self.samples[label].append(time.perf_counter() - started)
+        if response.status_code == 503:
+            self.shed[label] += 1
+        elif response.status_code not in OK:
+            self.errors[label] += 1
+        return response
+
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for label, samples in sorted(self.samples.items()):
+            cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+            out[label] = {
+                "count": len(samples),
+                "rps": round(len(samples) / elapsed, 1),
+                "p50_ms": round(cuts[49] * 1000, 2),
+                "p95_ms": round(cuts[94] * 1000, 2),
+                "p99_ms": round(cuts[98] * 1000, 2),
+                "errors": self.errors[label],
+                "shed": self.shed[label],
+            }
+        return out
+
+
+async def login(rec: Recorder, client, rng, label="POST /users/login"):
+    user = f"user{rng.randrange(args.users)}"
+    response = await rec.call(client, label, "POST", "/users/login", data={"username": user, "password": PASSWORD})
+    if response is not None and response.status_code == 200:
+        return response.json()["access_token"]
+    return None
+
+
+async def public_read(rec, client, rng, ids, tokens):
+    pick = rng.random()
+    if pick < 0.35:
+        await rec.call(client, "GET /blogs/", "GET", "/blogs/")
+    elif pick < 0.6:
+        await rec.call(client, "GET /blogs/blog-id/{id}", "GET", f"/blogs/blog-id/{rng.choice(ids['blogs'])}")
+    elif pick < 0.8:
+        await rec.call(client, "GET /faqs/", "GET", "/faqs/")
+    else:
+        await rec.call(client, "GET /faqs/{id}", "GET", f"/faqs/{rng.choice(ids['faqs'])}")
+
+
+async def dashboard_poll(rec, client, rng, ids, tokens):
+    headers = {"Authorization": f"Bearer {rng.choice(tokens)}"}
+    for path in ("/dashboard/stats", "/dashboard/recent-messages", "/dashboard/recent-blogs"):
+        await rec.call(client, f"GET {path}", "GET", path, headers=headers)
+
+
+async def contact_submit(rec, client, rng, ids, tokens):
+    n = rng.randrange(10**7)
+    await rec.call(client, "POST /contacts/create", "POST", "/contacts/create", json={
+        "name": f"Load Test {n}", "email": f"load{n}@example.com", "phone": f"+1666{n:07d}",
+        "service": "kitchen", "message": "Please call me back.",
+    })
+
+
+async def login_scenario(rec, client, rng, ids, tokens):
+    await login(rec, client, rng)
+
+
+SCENARIOS = {
+    "public_read": public_read,
+    "dashboard_poll": dashboard_poll,
+    "contact_submit": contact_submit,
+    "login": login_scenario,
+}
+
+
+async def virtual_user(rec, client, rng, ids, tokens, deadline):
+    names, weights = list(MIX), list(MIX.values())
+    while time.monotonic() < deadline:
+        await SCENARIOS[rng.choices(names, weights)[0]](rec, client, rng, ids, tokens)
+
+
+async def drive(base_url: str, ids) -> Dict[str, Dict[str, float]]:
+    rec = Recorder()
+    limits = httpx.Limits(max_connections=max(args.concurrency, args.login_burst))
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        rng = random.Random(args.seed)
+        started = time.perf_counter()
+        burst = await asyncio.gather(*(
+            login(rec, client, random.Random(rng.random()), "POST /users/login (burst)")
+            for _ in range(args.login_burst)
+        ))
+        burst_elapsed = time.perf_counter() - started
+        tokens = [t for t in burst if t] or [await login(rec, client, rng)]
+
+        started = time.perf_counter()
+        deadline = time.monotonic() + args.duration
+        await asyncio.gather(*(
+            virtual_user(rec, client, random.Random(rng.random()), ids, tokens, deadline)
+            for _ in range(args.concurrency)
+        ))
+        mixed_elapsed = time.perf_counter() - started
+
+    results = rec.summary(mixed_elapsed)
+    burst_label = "POST /users/login (burst)"
+    if burst_label in results:
+        results[burst_label]["rps"] = round(results[burst_label]["count"] / burst_elapsed, 1)
+    return results
+
+
+# --- server -------------------------------------------------------------------
+
+def start_server() -> subprocess.Popen:
+    # One client address logs in hundreds of times: measure the app, not the limiter
+    env = {**os.environ, "DB_ASYNC": args.db_async, "DEBUG": "false", "RATE_LIMITS": "{}"}
+    log = open("/tmp/loadtest-server.log", "w")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit("server exited during startup, see /tmp/loadtest-server.log")
+        try:
+            if httpx.get(f"http://127.0.0.1:{args.port}/faqs/", timeout=1).status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise SystemExit("server did not become ready within 60s")
+
+
+# --- reporting ----------------------------------------------------------------
+
+def print_table(results, baseline=None) -> List[str]:
+    regressions = []
+    print(f"{'endpoint':<34} {'count':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'err':>5} {'shed':>5}"
+          + ("   vs baseline (p95 / rps)" if baseline else ""))
+    for label, r in results.items():
+        line = (f"{label:<34} {r['count']:>7} {r['rps']:>8.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} "
+                f"{r['p99_ms']:>8.2f} {r['errors']:>5} {r['shed']:>5}")
+        base = (baseline or {}).get(label)
+        if base:
+            p95 = r["p95_ms"] / base["p95_ms"] - 1 if base["p95_ms"] else 0.0
+            rps = r["rps"] / base["rps"] - 1 if base["rps"] else 0.0
+            flag = ""
+            if p95 > args.tolerance or rps < -args.tolerance:
+                regressions.append(label)
+                flag = "  REGRESSION"
+            line += f"   {p95:+7.0%} / {rps:+7.0%}{flag}"
+        print(line)
+    return regressions
+
+
+def main() -> None:
+    engine = create_engine(args.database_url)
+    seed(engine)
+    with engine.connect() as conn:
+        ids = {
+            "blogs": conn.scalars(select(Blog.id)).all(),
+            "faqs": conn.scalars(select(FAQ.id)).all(),
+        }
+    engine.dispose()
+
+    server = start_server()
+    try:
+        results = asyncio.run(drive(f"http://127.0.0.1:{args.port}", ids))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    report = {
+        "meta": {
+            "when": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "database": engine.dialect.name,
+            "db_async": args.db_async,
+            "workers": args.workers,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "rows": {"users": args.users, "blogs": args.blogs, "faqs": args.faqs, "contacts": args.contacts},
+        },
+        "endpoints": results,
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["endpoints"]
+    regressions = print_table(results, baseline)
+
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+    if regressions:
+        raise SystemExit(f"{len(regressions)} endpoint(s) regressed beyond {args.tolerance:.0%}: "
+                         + ", ".join(regressions))
+
+
+if __name__ == "__main__":
+    main()
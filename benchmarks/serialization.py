@@ -0,0 +1,143 @@
+# benchmarks/serialization.py
+"""
+Response serialization cost per 1k blogs and contacts.
+
+Times result -> schema -> bytes against an in-memory SQLite database, the
+way FastAPI runs it for a `response_model` endpoint or the blog routes'
+cached bytes. Building the rows is included, since ORM hydration is part
+of what the old path paid for:
+
+  blogs     before: ORM instances, a `__dict__` copy each
+            after:  plain column rows
+  contacts  before: EmailStr re-validated on output, JSONResponse
+            after:  plain str, ORJSONResponse
+
+    python -m benchmarks.serialization --rows 1000
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+parser.add_argument("--rows", type=int, default=1000)
+parser.add_argument("--repeat", type=int, default=20)
+args = parser.parse_args()
+
+# Settings are read at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "bench")
+os.environ.setdefault("ALGORITHM", "HS256")
+
+from typing import List  # noqa: E402
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from pydantic import EmailStr, TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import Session, joinedload  # noqa: E402
+
+from app.models.base import Base  # noqa: E402
+from app.models import faq  # noqa: E402,F401
+from app.models.blog import Blog  # noqa: E402
+from app.models.contacts import ContactMessage, ContactStatus  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.routers.blogs import _blog_columns  # noqa: E402
+from app.schemas.blog import BlogResponse  # noqa: E402
+from app.schemas.contacts import ContactRead  # noqa: E402
+
+blogs_adapter = TypeAdapter(List[BlogResponse])
+contacts_adapter = TypeAdapter(List[ContactRead])
+
+
+def seed(session: Session, rows: int) -> None:
+    users = [User(username=f"author{i}", email=f"author{i}@example.com") for i in range(rows)]
+    session.add_all(users)
+    session.flush()
+    session.add_all(
+        Blog(
+            title=f"Post {i}",
+            content="Before and after photos of the remodel. " * 20,
+            image=f"http://127.0.0.1:8000/static/images/ab/{i:060x}.png",
+            image_srcset={"image/webp": f"/static/images/{i}-320.webp 320w, /static/images/{i}-640.webp 640w"},
+            owner_id=user.id,
+        )
+        for i, user in enumerate(users)
+    )
+    start = datetime(2024, 1, 1)
+    session.add_all(
+        ContactMessage(
+            name=f"Lead {i}", email=f"lead{i}@example.com", phone=f"+1555{i:07d}",
+            service="kitchen", preferred_time="morning", message="Please call me back. " * 10,
+            status=ContactStatus.new, created_at=start + timedelta(seconds=i),
+        )
+        for i in range(rows)
+    )
+    session.commit()
+
+
+def render(response_class, adapter, data) -> bytes:
+    # FastAPI's serialize_response: validate, dump to JSON-ready Python, then the response class encodes
+    content = adapter.dump_python(adapter.validate_python(data, from_attributes=True), mode="json")
+    return response_class(content).body
+
+
+def blogs_before(session: Session) -> bytes:
+    # ORM instances with the owner joined in, copied through __dict__ per blog
+    blogs = session.scalars(select(Blog).options(joinedload(Blog.owner))).all()
+    copies = []
+    for blog in blogs:
+        blog_dict = blog.__dict__.copy()
+        blog_dict["author"] = blog.owner.username if blog.owner else None
+        copies.append(blog_dict)
+    return blogs_adapter.dump_json(blogs_adapter.validate_python(copies))
+
+
+def blogs_after(session: Session) -> bytes:
+    result = session.execute(
+        select(*_blog_columns(include_content=True)).outerjoin(User, User.id == Blog.owner_id)
+    )
+    keys = list(result.keys())
+    return blogs_adapter.dump_json(blogs_adapter.validate_python([dict(zip(keys, row)) for row in result]))
+
+
+class ContactReadEmailStr(ContactRead):
+    email: EmailStr
+
+
+def contacts_before(session: Session) -> bytes:
+    contacts = session.scalars(select(ContactMessage)).all()
+    return render(JSONResponse, TypeAdapter(List[ContactReadEmailStr]), contacts)
+
+
+def contacts_after(session: Session) -> bytes:
+    contacts = session.scalars(select(ContactMessage)).all()
+    return render(ORJSONResponse, contacts_adapter, contacts)
+
+
+def per_1k_ms(fn, session: Session) -> float:
+    # Best of --repeat: the least disturbed run. The identity map is emptied
+    # each time so ORM rows are rebuilt, as they are for a fresh request.
+    best = float("inf")
+    for _ in range(args.repeat):
+        session.expunge_all()
+        started = time.perf_counter()
+        fn(session)
+        best = min(best, time.perf_counter() - started)
+    return best / args.rows * 1000 * 1000
+
+
+def main() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        seed(session, args.rows)
+        for name, before, after in [("blogs", blogs_before, blogs_after), ("contacts", contacts_before, contacts_after)]:
+            assert json.loads(before(session)) == json.loads(after(session)), name
+            old = per_1k_ms(before, session)
+            new = per_1k_ms(after, session)
+            print(f"{name:9} before {old:7.2f} ms/1k   after {new:7.2f} ms/1k   speedup {old / new:4.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# Settings are read at import time, so point the app at a scratch database
+# before anything under app/ is imported.
+_tmpdir = tempfile.mkdtemp(prefix="backend-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmpdir}/test.db")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("TOKEN_SWEEP_INTERVAL_SECONDS", "0")
+os.environ.setdefault("UPLOAD_DIR", f"{_tmpdir}/images")
+# Every test logs in from the same client address; test_rate_limit builds its own limiter
+os.environ.setdefault("RATE_LIMITS", "{}")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    # The app no longer creates tables itself (that is Alembic's job in
+    # deployments); the scratch test database gets them straight from the models.
+    from app.models import blog, contacts, faq, stats, user  # noqa: F401
+    from app.models.base import Base, get_engine
+
+    Base.metadata.create_all(get_engine())
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def _clean_state():
+    yield
+    from app.core.identity_cache import identity_cache
+    from app.core.response_cache import response_cache
+    from app.core.ttl_cache import dashboard_cache
+    from app.models.base import Base, get_engine
+
+    with get_engine().begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    response_cache.clear()
+    dashboard_cache.clear()
+    identity_cache.clear()  # rows were deleted behind the ORM's back
+
+
+@pytest.fixture
+def auth_headers(client):
+    user = {"username": "tester", "email": "tester@example.com", "password": "secret123"}
+    assert client.post("/users/register", json=user).status_code == 201
+    token = client.post(
+        "/users/login", data={"username": user["username"], "password": user["password"]}
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def db():
+    from app.models.base import get_sessionmaker
+
+    session = get_sessionmaker()()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def max_queries():
+    """
+    Fail if the block runs more than `limit` SQL statements:
+
+        with max_queries(2):
+            client.get("/blogs/")
+
+    The failure lists the statements, grouped by shape, so an N+1 stands out.
+    """
+    from collections import Counter
+
+    from sqlalchemy import event
+    from app.core.sql_profiler import repeated_shapes
+    from app.models.base import sync_engine_for_events
+
+    target = sync_engine_for_events()
+
+    @contextmanager
+    def check(limit):
+        statements = Counter()
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements[statement] += 1
+
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+        total = sum(statements.values())
+        if total > limit:
+            shapes = "\n".join(f"  {n}x {shape}" for shape, n in repeated_shapes(statements, 1))
+            pytest.fail(f"expected at most {limit} queries, ran {total}:\n{shapes}")
+
+    return check
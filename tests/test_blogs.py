@@ -0,0 +1,165 @@
+import asyncio
+import io
+import os
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.blog import Blog
+from app.models.user import User
+
+
+def _seed_blogs(db, count, prefix="Post number"):
+    authors = [User(username=f"{prefix}-{i}", email=f"{i}@{prefix.replace(' ', '')}.com") for i in range(count)]
+    db.add_all(authors)
+    db.flush()
+    db.add_all(
+        Blog(title=f"{prefix} {i}", content="x" * 500, owner_id=author.id)
+        for i, author in enumerate(authors)
+    )
+    db.commit()
+
+
+def test_list_blogs_query_count_is_constant(client, db, max_queries):
+    _seed_blogs(db, 3)
+    with max_queries(1):
+        assert len(client.get("/blogs/").json()) == 3
+
+    _seed_blogs(db, 30, prefix="Another post")
+    with max_queries(1):
+        assert len(client.get("/blogs/", params={"limit": 100}).json()) == 33
+
+
+def test_list_blogs_pages_without_content(client, db):
+    _seed_blogs(db, 5)
+    first = client.get("/blogs/", params={"limit": 3})
+    assert [b["title"] for b in first.json()] == ["Post number 4", "Post number 3", "Post number 2"]
+    assert all(b["content"] is None and b["author"] for b in first.json())
+
+    rest = client.get("/blogs/", params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]})
+    assert [b["title"] for b in rest.json()] == ["Post number 1", "Post number 0"]
+    assert "X-Next-Cursor" not in rest.headers
+
+    full = client.get("/blogs/", params={"include_content": True}).json()
+    assert full[0]["content"] == "x" * 500
+
+
+def test_get_blog_is_one_query(client, db, max_queries):
+    _seed_blogs(db, 2)
+    blog_id = db.query(Blog.id).filter(Blog.title == "Post number 1").scalar()
+    with max_queries(1):
+        body = client.get(f"/blogs/blog-id/{blog_id}").json()
+    assert body["author"] == "Post number-1" and body["content"] == "x" * 500
+    assert "_sa_instance_state" not in body
+    assert client.get("/blogs/blog-id/999999").status_code == 404
+
+
+def test_create_blog_generates_variants_in_background(client, auth_headers):
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.new("RGB", (800, 400), "teal").save(buf, format="PNG")
+    created = client.post(
+        "/blogs/",
+        data={"title": "Tiled shower", "content": "Before and after photos."},
+        files={"image": ("shower.png", buf.getvalue(), "image/png")},
+        headers=auth_headers,
+    ).json()
+    assert created["image_srcset"] is None  # response doesn't wait for resizing
+
+    for _ in range(100):
+        srcset = client.get(f"/blogs/blog-id/{created['id']}").json()["image_srcset"]
+        if srcset:
+            break
+        time.sleep(0.05)
+    assert srcset["image/webp"].endswith("-640.webp 640w")
+    # Variants sit next to the original, under the same URL root
+    first_url = srcset["image/webp"].split(" ")[0]
+    assert first_url.rsplit("/", 1)[0] == created["image"].rsplit("/", 1)[0]
+    assert client.get(first_url).headers["content-type"] == "image/webp"
+    assert srcset["image/png"].count("w,") == 1  # 320 and 640; 1280 exceeds the source
+
+    from app.core import image_variants
+    assert image_variants._pool()._mp_context.get_start_method() != "fork"
+
+
+def test_create_blog_refuses_before_writing_the_image(client, auth_headers, monkeypatch):
+    from app.core.config import get_settings
+
+    upload_dir = get_settings().upload_dir
+    stored_before = sorted(p for p in os.listdir(upload_dir)) if os.path.isdir(upload_dir) else []
+
+    def post(title, image, **kwargs):
+        return client.post(
+            "/blogs/",
+            data={"title": title, "content": "Body"},
+            files={"image": ("big.png", image, "image/png")},
+            headers=auth_headers,
+            **kwargs,
+        )
+
+    created = post("Taken", b"small").json()
+    # The URL points at UPLOAD_DIR, wherever that is, through its own mount
+    assert created["image"].startswith("http://testserver/static/images/")
+    assert client.get(created["image"]).content == b"small"
+    # Same bytes under another name are stored once, at a content-addressed path
+    again = client.post("/blogs/", data={"title": "Same image", "content": "Body"},
+                        files={"image": ("photo.PNG", b"small", "image/png")}, headers=auth_headers).json()
+    assert again["image"] == created["image"]
+    assert created["image"].endswith(".png") and created["image"].count("/") == 7
+    # A taken title is refused when the image part begins, with nothing spooled or stored
+    spools = []
+    monkeypatch.setattr("starlette.formparsers.SpooledTemporaryFile", lambda *a, **k: spools.append(1))
+    assert post("Taken", b"x" * (3 * 1024 * 1024)).status_code == 400
+    assert spools == []
+
+    monkeypatch.setattr(get_settings(), "upload_max_bytes", 1024)
+    response = post("Too big", b"x" * 4096)
+    assert response.status_code == 413 and "byte limit" in response.json()["detail"]
+    assert client.post("/blogs/", data={"title": "No image", "content": "Body"}, headers=auth_headers).status_code == 415
+    missing = client.post("/blogs/", data={"title": "No image"}, files={"other": ("a.txt", b"a")}, headers=auth_headers)
+    assert missing.status_code == 422
+    assert [error["loc"] for error in missing.json()["detail"]] == [["body", "content"], ["body", "image"]]
+
+    # One stored file in all: no temp files, nothing from refused uploads
+    leftovers = [p for p in os.listdir(upload_dir) if p.startswith(".upload-")]
+    assert leftovers == [] and len(os.listdir(upload_dir)) == len(stored_before) + 1
+
+
+def test_receive_upload_form_refuses_on_content_length_unread(tmp_path):
+    from starlette.requests import Request
+
+    from app.core.uploads import receive_upload_form
+
+    received = []
+    head = b'--abc\r\nContent-Disposition: form-data; name="image"; filename="a.png"\r\n\r\n'
+
+    async def receive():
+        received.append(1)
+        return {"type": "http.request", "body": b"x" * 1024 if len(received) > 1 else head, "more_body": True}
+
+    request = Request({
+        "type": "http",
+        "method": "POST",
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=abc"),
+            (b"content-length", str(10 * 1024 * 1024).encode()),
+        ],
+    }, receive)
+
+    async def allow(fields):
+        pass
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(receive_upload_form(request, "image", allow, root=str(tmp_path), max_bytes=1024, max_field_bytes=1024))
+    assert exc.value.status_code == 413 and received == []
+
+    # Without a Content-Length the image is cut off once past the limit
+    request = Request({"type": "http", "method": "POST", "headers": [
+        (b"content-type", b"multipart/form-data; boundary=abc"),
+    ]}, receive)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(receive_upload_form(request, "image", allow, root=str(tmp_path), max_bytes=1024, max_field_bytes=1024))
+    assert exc.value.status_code == 413 and len(received) == 3  # head + 1024 allowed + 1 over
+    assert list(tmp_path.iterdir()) == []
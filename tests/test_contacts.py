@@ -0,0 +1,293 @@
+import json
+
+from sqlalchemy import func, select
+
+from app.core.config import get_settings
+from app.models.contacts import ContactMessage
+from app.models.stats import StatsCounters
+
+
+def _seed_contacts(db, names, created_at=None):
+    from datetime import datetime, timezone
+
+    created_at = created_at or datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+    db.add_all(
+        ContactMessage(name=name, email=f"{name.lower()}@example.com", phone="+15551234567", created_at=created_at)
+        for name in names
+    )
+    db.commit()
+
+
+def test_bulk_import_ndjson_batches_and_reports_bad_rows(client, auth_headers, db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "contact_import_batch_size", 2)
+    rows = [
+        {"name": "Ann", "email": "ann@example.com", "phone": "+15551234567"},
+        {"name": "Bob", "email": "not-an-email", "phone": "+15551234567"},
+        {"name": "Cy", "email": "cy@example.com", "phone": "(419) 555-1234", "service": " roofing "},
+        {"name": "Bot", "email": "bot@example.com", "phone": "+15551234567", "website": "http://spam"},
+        {"name": "Dee", "email": "dee@example.com", "phone": "+15550000000"},
+    ]
+    body = "\n".join(json.dumps(row) for row in rows[:2]) + "\n{oops\n\n" + "\n".join(json.dumps(row) for row in rows[2:])
+
+    assert client.post("/contacts/bulk", content=body, headers={"Content-Type": "application/x-ndjson"}).status_code == 401
+    response = client.post(
+        "/contacts/bulk", content=body, headers={**auth_headers, "Content-Type": "application/x-ndjson"}
+    )
+    result = response.json()
+    assert response.status_code == 200
+    assert (result["inserted"], result["skipped"], result["failed"]) == (3, 1, 2)
+    assert [error["line"] for error in result["errors"]] == [2, 3]
+    assert result["errors"][0]["errors"][0].startswith("email:")
+
+    assert db.scalar(select(func.count()).select_from(ContactMessage)) == 3
+    assert db.scalar(select(ContactMessage.service).where(ContactMessage.name == "Cy")) == "roofing"
+    counters = db.get(StatsCounters, 1)
+    assert (counters.messages, counters.new_messages) == (3, 3)
+
+
+def test_bulk_import_csv_handles_quoted_newlines(client, auth_headers, db):
+    body = (
+        "\ufeffname,email,phone,message\r\n"
+        'Ann,ann@example.com,+15551234567,"Line one\r\nline two, with a ""quote"""\r\n'
+        "Bob,bob@example.com\r\n"
+        "Cy,cy@example.com,4195551234,\r\n"
+    ).encode()
+    result = client.post(
+        "/contacts/bulk", content=body, headers={**auth_headers, "Content-Type": "text/csv; charset=utf-8"}
+    ).json()
+    assert (result["inserted"], result["failed"]) == (2, 1)
+    assert result["errors"] == [{"line": 4, "errors": ["expected 4 fields, got 2"]}]
+    messages = dict(db.execute(select(ContactMessage.name, ContactMessage.message)).all())
+    assert messages == {"Ann": 'Line one\nline two, with a "quote"', "Cy": None}
+
+    assert client.post(
+        "/contacts/bulk", content=b"{}", headers={**auth_headers, "Content-Type": "application/json"}
+    ).status_code == 415
+
+
+def test_bulk_import_csv_stray_and_unclosed_quotes_cost_one_row(client, auth_headers, db, monkeypatch):
+    monkeypatch.setattr(get_settings(), "contact_import_max_record_length", 200)
+    body = (
+        "name,email,phone,message\n"
+        "Ann,ann@example.com,+15551234567,hello\n"
+        'Bob,bob@example.com,+15551234567,Need a 5" tile border\n'
+        'Cy,cy@example.com,+15551234567,"never closed\n'
+        + "".join(f"P{n},p{n}@example.com,+15551234567,ok\n" for n in range(10))
+        + "Dee,dee@example.com,+15551234567," + "x" * 300 + "\n"
+        "Eve,eve@example.com,+15551234567,bye\n"
+    ).encode()
+    result = client.post(
+        "/contacts/bulk", content=body, headers={**auth_headers, "Content-Type": "text/csv"}
+    ).json()
+    assert result["errors"] == [
+        {"line": 4, "errors": ["record longer than 200 characters"]},
+        {"line": 15, "errors": ["record longer than 200 characters"]},
+    ]
+    assert (result["inserted"], result["failed"]) == (13, 2)
+    messages = dict(db.execute(select(ContactMessage.name, ContactMessage.message)).all())
+    assert messages["Bob"] == 'Need a 5" tile border' and messages["Eve"] == "bye"
+
+
+def test_export_streams_filtered_contacts(client, auth_headers, db, monkeypatch):
+    import csv
+    import io
+
+    monkeypatch.setattr(get_settings(), "contact_export_batch_size", 2)
+    db.add_all(
+        ContactMessage(name=name, email=f"{name.lower()}@example.com", phone="+15551234567", status=status,
+                       message="Hi, \"kitchen\"\nthanks" if name == "Ann" else None)
+        for name, status in [("Ann", "new"), ("Bob", "read"), ("Annette", "new"), ("Cy", "new"), ("Anna", "archived")]
+    )
+    db.commit()
+
+    assert client.get("/contacts/export").status_code == 401
+    response = client.get("/contacts/export", headers=auth_headers)
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"].startswith('attachment; filename="contacts-')
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["Ann", "Bob", "Annette", "Cy", "Anna"]
+    assert rows[0]["message"] == 'Hi, "kitchen"\nthanks' and rows[1]["message"] == ""
+
+    response = client.get(
+        "/contacts/export", params={"format": "ndjson", "q": "ann", "status": "new"}, headers=auth_headers
+    )
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["name"] for line in lines] == ["Ann", "Annette"]
+    assert lines[0]["status"] == "new" and lines[0]["created_at"]
+
+
+def test_write_behind_answers_202_and_drains_on_shutdown(db, monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    monkeypatch.setattr(get_settings(), "contact_write_behind", True)
+    contact = {"name": "Ann", "email": "ann@example.com", "phone": "+15551234567"}
+    with TestClient(app) as client:
+        responses = [client.post("/contacts/create", json=contact) for _ in range(3)]
+        assert {response.status_code for response in responses} == {202}
+        assert client.post("/contacts/create", json={**contact, "website": "x"}).status_code == 204
+    references = {response.json()["id"] for response in responses}
+
+    assert set(db.scalars(select(ContactMessage.reference))) == references
+    counters = db.get(StatsCounters, 1)
+    assert (counters.messages, counters.new_messages) == (3, 3)
+
+
+def test_contact_queue_applies_backpressure_and_flushes_in_batches():
+    import asyncio
+
+    import pytest
+    from fastapi import HTTPException
+
+    from app.core.contact_queue import ContactQueue
+
+    async def scenario():
+        queue = ContactQueue(max_size=2, batch_size=3, interval=0.01, put_timeout=0.05)
+        batches, release = [], asyncio.Event()
+
+        async def write(batch):
+            await release.wait()
+            batches.append([row["n"] for row in batch])
+
+        queue._write = write
+        queue.start()
+        await queue.put({"n": 0})
+        await asyncio.sleep(0.05)  # the flusher takes row 0 and blocks writing it
+        await queue.put({"n": 1})
+        await queue.put({"n": 2})
+        with pytest.raises(HTTPException) as exc:
+            await queue.put({"n": 3})
+        assert exc.value.status_code == 503 and exc.value.headers == {"Retry-After": "1"}
+
+        release.set()
+        await queue.put({"n": 3})
+        await queue.put({"n": 4})
+        await queue.shutdown()
+        assert sorted(sum(batches, [])) == [0, 1, 2, 3, 4]
+        assert max(len(batch) for batch in batches) <= 3
+        with pytest.raises(HTTPException):
+            await queue.put({"n": 5})
+
+    asyncio.run(scenario())
+
+
+def test_list_contacts_keyset_pages_break_created_at_ties_by_id(client, db):
+    from datetime import datetime, timezone
+
+    _seed_contacts(db, ["Old"], datetime(2026, 4, 1, tzinfo=timezone.utc))
+    _seed_contacts(db, ["Ann", "Bob", "Cy", "Dee"])  # same created_at
+    expected = ["Dee", "Cy", "Bob", "Ann", "Old"]
+
+    seen, cursor, pages = [], None, []
+    while True:
+        params = {"limit": 2, "count": "none", **({"cursor": cursor} if cursor else {})}
+        page = client.get("/contacts", params=params).json()
+        pages.append(page)
+        seen += [item["name"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        assert page["has_more"] is (cursor is not None)
+        if cursor is None:
+            break
+    assert seen == expected
+    assert [len(page["items"]) for page in pages] == [2, 2, 1]
+    assert all(page["total"] is None for page in pages)
+
+    # An exact last page reports no more rows
+    last = client.get("/contacts", params={"limit": 1, "cursor": pages[1]["next_cursor"]}).json()
+    assert [item["name"] for item in last["items"]] == ["Old"] and last["has_more"] is False
+    assert last["next_cursor"] is None and last["total"] == 5
+
+    # offset paging still orders the same way
+    assert [item["name"] for item in client.get("/contacts", params={"offset": 3}).json()["items"]] == ["Ann", "Old"]
+
+
+def test_list_contacts_counts_and_rejects_bad_cursors(client, db):
+    _seed_contacts(db, ["Ann", "Bob", "Cy"])
+    assert client.get("/contacts", params={"limit": 1}).json()["total"] == 3
+    assert client.get("/contacts", params={"limit": 1, "count": "estimate"}).json()["total"] == 3
+    assert client.get("/contacts", params={"count": "estimate", "q": "bob"}).json()["total"] == 1
+    assert client.get("/contacts", params={"count": "bogus"}).status_code == 422
+
+    from app.core.pagination import encode_cursor
+
+    for cursor in ("not base64!", encode_cursor("x"), encode_cursor("not-a-date", 1), encode_cursor("2026-05-01", "x")):
+        response = client.get("/contacts", params={"cursor": cursor})
+        assert (response.status_code, response.json()["detail"]) == (400, "Invalid cursor")
+
+
+def _search(client, q, **params):
+    return [item["name"] for item in client.get("/contacts", params={"q": q, "limit": 100, **params}).json()["items"]]
+
+
+def test_search_index_follows_inserts_updates_and_deletes(client, db):
+    from sqlalchemy import text
+
+    _seed_contacts(db, ["Mary Smithson", "Lee Jones"])
+    assert _search(client, "smith") == ["Mary Smithson"]
+
+    mary = db.scalars(select(ContactMessage).where(ContactMessage.name == "Mary Smithson")).one()
+    mary.name, mary.email = "Mary Brown", "mary@brown.example"
+    mary.service = "kitchen remodel"
+    db.commit()
+    assert _search(client, "smith") == []
+    assert _search(client, "brown") == _search(client, "remodel") == ["Mary Brown"]
+
+    db.delete(mary)
+    db.commit()
+    assert _search(client, "brown") == []
+    indexed = db.execute(text("SELECT rowid, name FROM contact_messages_fts WHERE contact_messages_fts MATCH '\"jones\"'"))
+    assert [name for _, name in indexed] == ["Lee Jones"]
+
+
+def test_search_short_terms_and_fts_syntax_are_plain_substrings(client, db):
+    _seed_contacts(db, ["Jo Ann", "Bob O\"Neil", "Cy (NEAR) OR*"])
+    # Under 3 characters the trigram index can't help; ILIKE still matches
+    assert _search(client, "jo") == ["Jo Ann"]
+    assert _search(client, "o\"") == ["Bob O\"Neil"]
+    # Quotes, operators and parentheses are searched for, never parsed
+    for term, expected in [('O"Neil', ["Bob O\"Neil"]), ("(NEAR)", ["Cy (NEAR) OR*"]), ("ann OR bob", []),
+                           ("NEAR(", []), ('"', ["Bob O\"Neil"]), ("OR*", ["Cy (NEAR) OR*"])]:
+        response = client.get("/contacts", params={"q": term})
+        assert response.status_code == 200, term
+        assert [item["name"] for item in response.json()["items"]] == expected, term
+
+
+def test_search_relevance_pages_by_rank_then_id(client, db):
+    _seed_contacts(db, ["Roof Roofer Roofing", "Ann Roof", "Bob Roof", "Cy Smith", "Dee Roofs"])
+    ranked = _search(client, "roof", sort="relevance")
+    assert len(ranked) == 4 and ranked[0] == "Roof Roofer Roofing"
+
+    seen, cursor = [], None
+    while True:
+        params = {"q": "roof", "sort": "relevance", "limit": 1, "count": "none", **({"cursor": cursor} if cursor else {})}
+        page = client.get("/contacts", params=params).json()
+        seen += [item["name"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == ranked
+
+    # Equal ranks fall back to id, newest id first
+    tied = [name for name in ranked if name in ("Ann Roof", "Bob Roof")]
+    assert tied == ["Bob Roof", "Ann Roof"]
+
+
+def test_search_for_a_common_term_walks_the_newest_index(client, db, monkeypatch, max_queries):
+    from app.routers import contacts
+
+    _seed_contacts(db, ["Ann Roof", "Bob 100%", "Cy Roof_1", "Dee Roofs", "Eve Smith"])
+    terms = ["roof", "roof_", "100%", "smith", "zzqx"]
+    via_fts = {term: client.get("/contacts", params={"q": term, "limit": 2}).json() for term in terms}
+
+    # Every term now counts as common: the page comes from the index walk
+    monkeypatch.setattr(contacts, "FTS_WALK_MIN_MATCHES", 1)
+    with max_queries(3) as statements:
+        assert client.get("/contacts", params={"q": "roof", "limit": 2}).status_code == 200
+    pages = [sql for sql in statements if "ORDER BY" in sql]
+    assert len(pages) == 1 and "contact_messages_fts" not in pages[0]
+    for term in terms:
+        # Same rows, cursor and total either way; LIKE wildcards in the term are literal
+        assert client.get("/contacts", params={"q": term, "limit": 2}).json() == via_fts[term], term
+    assert [item["name"] for item in via_fts["roof_"]["items"]] == ["Cy Roof_1"]
+    assert via_fts["roof"]["total"] == 3
@@ -0,0 +1,59 @@
+import asyncio
+
+from sqlalchemy import update
+
+from app.core.stats_counters import reconcile_once
+from app.core.ttl_cache import TTLCache, dashboard_cache
+from app.models.stats import StatsCounters
+
+CONTACT = {"name": "Ann", "email": "ann@example.com", "phone": "+15551234567"}
+
+
+def stats(client, headers):
+    body = client.get("/dashboard/stats", headers=headers).json()
+    return {item["title"]: int(item["value"]) for item in body["stats"]}
+
+
+def test_stats_follow_writes_and_reconcile_repairs_drift(client, auth_headers, db):
+    first = client.post("/contacts/create", json=CONTACT).json()
+    client.post("/contacts/create", json=CONTACT)
+    client.delete(f"/contacts/{first['id']}")
+
+    assert stats(client, auth_headers) == {
+        "New Messages": 1, "Total Patients": 1, "Blog Posts": 0, "All Messages": 1,
+    }
+
+    db.execute(update(StatsCounters).values(users=42, messages=0))
+    db.commit()
+    assert stats(client, auth_headers)["Total Patients"] == 1  # still cached
+    dashboard_cache.clear()
+    assert stats(client, auth_headers)["Total Patients"] == 42
+
+    client.portal.call(reconcile_once)
+    dashboard_cache.clear()
+    assert stats(client, auth_headers) == {
+        "New Messages": 1, "Total Patients": 1, "Blog Posts": 0, "All Messages": 1,
+    }
+
+
+def test_ttl_cache_coalesces_misses_and_serves_stale_while_refreshing():
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    async def scenario():
+        cache = TTLCache("test", ttl=0.05, stale_ttl=10)
+        assert await asyncio.gather(*(cache.get("k", load) for _ in range(10))) == [1] * 10
+        assert calls == 1
+
+        await asyncio.sleep(0.06)
+        assert await cache.get("k", load) == 1  # stale, refresh started
+        await asyncio.sleep(0.02)
+        assert await cache.get("k", load) == 2
+        assert calls == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,21 @@
+import re
+
+from app.models.base import get_async_engine
+
+
+def sample(metrics: str, line: str) -> float:
+    match = re.search(rf"^{re.escape(line)} (\S+)$", metrics, re.M)
+    assert match, line
+    return float(match.group(1))
+
+
+def test_pool_checkouts_are_reported_on_metrics(client):
+    name = "async" if get_async_engine() is not None else "sync"
+    before = sample(client.get("/metrics").text, f'db_pool_checkout_seconds_count{{engine="{name}"}}')
+
+    client.get("/faqs/")
+    metrics = client.get("/metrics").text
+
+    assert sample(metrics, f'db_pool_checkout_seconds_count{{engine="{name}"}}') > before
+    assert sample(metrics, f'db_pool_checked_out{{engine="{name}"}}') == 0
+    assert sample(metrics, f'db_pool_size{{engine="{name}"}}') == 5
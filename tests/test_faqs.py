@@ -0,0 +1,70 @@
+def test_faq_reads_are_cached_and_invalidated_by_writes(client, auth_headers):
+    created = client.post(
+        "/faqs/", json={"question": "Do you travel?", "answer": "Yes, within the county."}, headers=auth_headers
+    ).json()
+
+    assert client.get("/faqs/").headers["X-Cache"] == "MISS"
+    assert client.get("/faqs/").headers["X-Cache"] == "HIT"
+    assert client.get(f"/faqs/{created['id']}").headers["X-Cache"] == "MISS"
+
+    client.put(f"/faqs/{created['id']}", json={"answer": "Only on weekends."}, headers=auth_headers)
+
+    listed = client.get("/faqs/")
+    single = client.get(f"/faqs/{created['id']}")
+    assert listed.headers["X-Cache"] == single.headers["X-Cache"] == "MISS"
+    assert listed.json()[0]["answer"] == single.json()["answer"] == "Only on weekends."
+
+    client.delete(f"/faqs/{created['id']}", headers=auth_headers)
+    assert client.get("/faqs/").json() == []
+    assert client.get(f"/faqs/{created['id']}").status_code == 404
+
+
+def test_read_racing_a_write_does_not_cache_the_old_rows(client, auth_headers):
+    import asyncio
+
+    import httpx
+
+    from app.core.dependencies import get_db_session
+    from app.main import app
+
+    created = client.post("/faqs/", json={"question": "Open on Sundays?", "answer": "old answer"}, headers=auth_headers).json()
+    queried, release = asyncio.Event(), asyncio.Event()
+
+    class SlowSession:
+        """Lets the first GET read its rows, then holds it until the PUT has committed."""
+
+        def __init__(self, db):
+            self._db = db
+
+        def __getattr__(self, name):
+            return getattr(self._db, name)
+
+        async def scalars(self, statement):
+            rows = (await self._db.scalars(statement)).all()
+            if not queried.is_set():
+                queried.set()
+                await release.wait()
+            return type("Result", (), {"all": lambda self: rows})()
+
+    async def slow_db_session():
+        async for db in get_db_session():
+            yield SlowSession(db)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+            read = asyncio.create_task(ac.get("/faqs/"))
+            await queried.wait()
+            updated = await ac.put(f"/faqs/{created['id']}", json={"answer": "new answer"}, headers=auth_headers)
+            assert updated.status_code == 200
+            release.set()
+            assert (await read).json()[0]["answer"] == "old answer"  # read before the write
+            fresh = await ac.get("/faqs/")
+            assert fresh.headers["X-Cache"] == "MISS" and fresh.json()[0]["answer"] == "new answer"
+            assert (await ac.get("/faqs/")).headers["X-Cache"] == "HIT"
+
+    app.dependency_overrides[get_db_session] = slow_db_session
+    try:
+        asyncio.run(scenario())
+    finally:
+        app.dependency_overrides.pop(get_db_session)
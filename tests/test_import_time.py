@@ -0,0 +1,29 @@
+import os
+import subprocess
+import sys
+
+# Cold `import app.main` budget; override on slow CI with IMPORT_BUDGET_MS
+IMPORT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", 2000))
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_app_imports_within_budget_without_a_database():
+    # Nothing listens on port 1: importing must not connect, reflect or create tables
+    env = {**os.environ, "DATABASE_URL": "postgresql://nobody@127.0.0.1:1/unreachable"}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    cumulative_us = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            _, cumulative, name = line.split("|")
+            cumulative_us[name.strip()] = int(cumulative)
+
+    elapsed_ms = cumulative_us["app.main"] / 1000
+    print(f"import app.main: {elapsed_ms:.0f} ms")
+    assert elapsed_ms < IMPORT_BUDGET_MS
+    # Optional heavy dependencies stay out of the import path
+    assert not {"PIL", "sentry_sdk"} & cumulative_us.keys()
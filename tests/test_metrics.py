@@ -0,0 +1,28 @@
+import re
+
+
+def sample(metrics: str, line: str) -> float:
+    match = re.search(rf"^{re.escape(line)} (\S+)$", metrics, re.M)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_requests_are_counted_by_route_template(client):
+    before = client.get("/metrics").text
+    client.get("/faqs/")
+    client.get("/faqs/12345")
+    client.get("/static/does-not-exist.css")
+    client.get("/no/such/path")
+    after = client.get("/metrics").text
+
+    for line in (
+        'http_requests_total{method="GET",route="/faqs/",status="200"}',
+        'http_requests_total{method="GET",route="/faqs/{faq_id}",status="404"}',
+        'http_requests_total{method="GET",route="/static",status="404"}',
+        'http_requests_total{method="GET",route="<unmatched>",status="404"}',
+        'http_request_duration_seconds_count{method="GET",route="/faqs/",status="200"}',
+        'http_request_db_seconds_count{method="GET",route="/faqs/"}',
+    ):
+        assert sample(after, line) == sample(before, line) + 1, line
+    assert sample(after, 'http_request_db_seconds_sum{method="GET",route="/faqs/"}') > \
+        sample(before, 'http_request_db_seconds_sum{method="GET",route="/faqs/"}')
+    assert "http_requests_in_flight 1" in after  # the /metrics request itself
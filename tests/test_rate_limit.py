@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.rate_limit import MemoryBackend, RateLimitBackend, RateLimitMiddleware, parse_rate
+
+
+def _app(rules, max_concurrent=0, gate=None):
+    app = FastAPI()
+
+    @app.post("/users/login")
+    async def login():
+        return {"ok": True}
+
+    @app.get("/slow")
+    async def slow():
+        await gate.wait()
+        return {"ok": True}
+
+    @app.get("/metrics")
+    async def metrics():
+        return {"ok": True}
+
+    app.add_middleware(RateLimitMiddleware, rules=rules, backend=MemoryBackend(), max_concurrent=max_concurrent)
+    return app
+
+
+def test_parse_rate():
+    assert parse_rate("10/minute") == (10 / 60, 10)
+    assert parse_rate("2/seconds") == (2.0, 2)
+    for bad in ("ten/minute", "5/fortnight", "0/second"):
+        with pytest.raises(ValueError):
+            parse_rate(bad)
+
+
+def test_token_bucket_limits_per_client_and_route():
+    client = TestClient(_app({"POST /users/login": "3/minute"}))
+    assert [client.post("/users/login").status_code for _ in range(4)] == [200, 200, 200, 429]
+    refused = client.post("/users/login")
+    assert refused.json() == {"detail": "Too many requests"}
+    assert 1 <= int(refused.headers["Retry-After"]) <= 20  # one token every 20s
+
+    other = TestClient(_app({"POST /users/login": "3/minute"}), client=("10.0.0.2", 5000))
+    assert other.post("/users/login").status_code == 200
+
+
+def test_memory_backend_refills_and_evicts_least_recent():
+    backend = MemoryBackend(max_keys=2)
+
+    async def scenario():
+        assert await backend.take("a", 1000.0, 1) == 0
+        assert 0 < await backend.take("a", 1000.0, 1) <= 0.001
+        await asyncio.sleep(0.002)
+        assert await backend.take("a", 1000.0, 1) == 0
+        await backend.take("b", 1.0, 1)
+        await backend.take("c", 1.0, 1)
+        assert list(backend._buckets) == ["b", "c"]
+
+    asyncio.run(scenario())
+
+    class NoTake(RateLimitBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        NoTake()
+
+
+def test_concurrency_cap_sheds_with_503():
+    async def scenario():
+        import httpx
+
+        gate = asyncio.Event()
+        transport = httpx.ASGITransport(app=_app({}, max_concurrent=2, gate=gate))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            held = [asyncio.create_task(client.get("/slow")) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            shed = await client.get("/slow")
+            assert (shed.status_code, shed.headers["Retry-After"]) == (503, "1")
+            assert (await client.get("/metrics")).status_code == 200  # never shed
+            gate.set()
+            assert [r.status_code for r in await asyncio.gather(*held)] == [200, 200]
+            assert (await client.get("/slow")).status_code == 200
+
+    asyncio.run(scenario())
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+
+from app.core import security
+from app.core.config import get_settings
+from app.core.security import InvalidTokenError, create_access_token, decode_access_token
+
+
+@pytest.fixture
+def jwt_backend(monkeypatch):
+    def use(name):
+        monkeypatch.setattr(get_settings(), "jwt_backend", name)
+        security._jwt_backend.cache_clear()
+
+    yield use
+    security._jwt_backend.cache_clear()
+    security.claims_cache().clear()
+
+
+def test_backends_interoperate_and_reject_tampering(jwt_backend):
+    jwt_backend("python-jose")
+    jose_token = create_access_token({"sub": "ann"})
+    jwt_backend("pyjwt")
+    pyjwt_token = create_access_token({"sub": "bob"})
+
+    assert decode_access_token(jose_token)["sub"] == "ann"
+    jwt_backend("python-jose")
+    assert decode_access_token(pyjwt_token)["sub"] == "bob"
+
+    for backend in ("python-jose", "pyjwt"):
+        jwt_backend(backend)
+        with pytest.raises(InvalidTokenError):
+            decode_access_token(pyjwt_token[:-2] + "xx")
+
+
+def test_claims_cache_skips_verification_until_exp(jwt_backend, monkeypatch):
+    jwt_backend("pyjwt")
+    token = create_access_token({"sub": "ann"})
+    verified = []
+    real_verify = security._verify_token
+
+    def verify(t):
+        verified.append(t)
+        if security.time.time() >= real_verify(t)["exp"]:
+            raise InvalidTokenError("Signature has expired")
+        return real_verify(t)
+
+    monkeypatch.setattr(security, "_verify_token", verify)
+
+    first = decode_access_token(token)
+    first["sub"] = "mallory"  # callers get copies
+    assert decode_access_token(token)["sub"] == "ann"
+    assert len(verified) == 1
+
+    # Past exp the entry is gone, so the token goes back to the backend
+    monkeypatch.setattr(security.time, "time", lambda: first["exp"] + 1)
+    with pytest.raises(InvalidTokenError):
+        decode_access_token(token)
+    assert len(verified) == 2
+
+
+def test_claims_cache_is_bounded_lru():
+    cache = security.ClaimsCache(max_size=2)
+    exp = time.time() + 60
+    for name in ("a", "b"):
+        cache.put(cache.key(name), {"sub": name}, exp)
+    assert cache.get(cache.key("a")) == {"sub": "a"}  # a is now most recent
+    cache.put(cache.key("c"), {"sub": "c"}, exp)
+    assert cache.get(cache.key("b")) is None
+    assert cache.get(cache.key("a")) and cache.get(cache.key("c"))
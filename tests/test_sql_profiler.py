@@ -0,0 +1,38 @@
+import logging
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.sql_profiler import SQLProfilerMiddleware, statement_shape
+from app.models.base import get_engine
+
+
+def test_statement_shape_ignores_in_list_length():
+    assert statement_shape("SELECT * FROM t WHERE id IN (?, ?)") == \
+        statement_shape("SELECT *\n  FROM t WHERE id IN (?, ?, ?, ?)")
+
+
+def test_server_timing_reports_queries_and_repeats(client, caplog):
+    assert client.get("/faqs/").headers["Server-Timing"].startswith('db;dur=')
+
+    def loop(request):
+        with get_engine().connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return PlainTextResponse("ok")
+
+    app = SQLProfilerMiddleware(Starlette(routes=[Route("/loop", loop)]), repeat_threshold=3)
+    with caplog.at_level(logging.WARNING, logger="app.core.sql_profiler"):
+        timing = TestClient(app).get("/loop").headers["Server-Timing"]
+
+    assert 'desc="queries=3"' in timing
+    assert 'db-repeat;desc="3x SELECT ?"' in timing
+    assert "possible N+1: GET /loop ran 3x" in caplog.text
+
+
+def test_current_user_is_one_query(client, auth_headers, max_queries):
+    with max_queries(1):
+        assert client.get("/users/me", headers=auth_headers).status_code == 200
@@ -0,0 +1,49 @@
+import gzip
+
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.testclient import TestClient
+
+from app.core.static_files import IMMUTABLE, CachedStaticFiles, precompress
+
+HASHED = "ab" * 32
+
+
+def _client(root):
+    app = Starlette(routes=[Mount("/static", CachedStaticFiles(directory=str(root), max_age=60))])
+    return TestClient(app)
+
+
+def test_hashed_paths_are_immutable_and_support_304_and_ranges(tmp_path):
+    (tmp_path / "ab").mkdir()
+    (tmp_path / "ab" / f"{HASHED}.png").write_bytes(b"0123456789")
+    (tmp_path / "logo.png").write_bytes(b"plain")
+    client = _client(tmp_path)
+
+    hashed = client.get(f"/static/ab/{HASHED}.png")
+    assert hashed.headers["cache-control"] == IMMUTABLE
+    assert client.get("/static/logo.png").headers["cache-control"] == "public, max-age=60"
+
+    revalidated = client.get(f"/static/ab/{HASHED}.png", headers={"If-None-Match": hashed.headers["etag"]})
+    assert revalidated.status_code == 304
+
+    partial = client.get(f"/static/ab/{HASHED}.png", headers={"Range": "bytes=2-5"})
+    assert partial.status_code == 206 and partial.content == b"2345"
+
+
+def test_precompressed_sibling_is_served_when_accepted(tmp_path):
+    body = "body { color: teal; }\n" * 100
+    (tmp_path / "site.css").write_text(body)
+    assert precompress(str(tmp_path)) >= 1
+    client = _client(tmp_path)
+
+    raw = client.get("/static/site.css", headers={"Accept-Encoding": "gzip"})
+    assert raw.headers["content-encoding"] == "gzip"
+    assert raw.headers["content-type"].startswith("text/css")
+    assert raw.text == body  # httpx decodes it transparently
+
+    plain = client.get("/static/site.css", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    assert int(raw.headers["content-length"]) < int(plain.headers["content-length"])
+    assert gzip.decompress((tmp_path / "site.css.gz").read_bytes()).decode() == body
@@ -0,0 +1,261 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.core.identity_cache import CurrentUser, identity_cache
+from app.core.revocation import revoked_tokens
+from app.models.user import User
+
+
+@pytest.fixture(autouse=True)
+def _no_revocation_sync(monkeypatch):
+    # Keep the periodic revocation read out of the query counts
+    monkeypatch.setattr(revoked_tokens, "sync_seconds", 0)
+
+
+def test_current_user_is_cached_and_read_only(client, auth_headers, max_queries):
+    first = client.get("/users/me", headers=auth_headers).json()
+    with max_queries(0):
+        assert client.get("/users/me", headers=auth_headers).json() == first
+    cached = identity_cache.get("tester")
+    assert isinstance(cached, CurrentUser) and cached.id == first["id"]
+    with pytest.raises(AttributeError):
+        cached.is_active = False
+
+
+def test_user_changes_invalidate_the_cached_identity(client, auth_headers, db):
+    client.get("/users/me", headers=auth_headers)
+    assert identity_cache.get("tester") is not None
+
+    changed = client.post(
+        "/users/change-password",
+        json={"current_password": "secret123", "new_password": "secret456"},
+        headers=auth_headers,
+    )
+    assert changed.status_code == 204
+    assert identity_cache.get("tester") is None
+    assert client.post("/users/login", data={"username": "tester", "password": "secret456"}).status_code == 200
+
+    # Any ORM change to the user, e.g. deactivation, drops the entry on commit
+    assert client.get("/users/me", headers=auth_headers).json()["is_active"] is True
+    user = db.query(User).filter(User.username == "tester").one()
+    user.is_active = False
+    db.commit()
+    assert client.get("/users/me", headers=auth_headers).json()["is_active"] is False
+
+    # Rolled-back changes leave it alone; bulk UPDATEs wait out the TTL
+    user.email = "other@example.com"
+    db.flush()
+    db.rollback()
+    db.execute(update(User).values(email="bulk@example.com"))
+    db.commit()
+    assert client.get("/users/me", headers=auth_headers).json()["email"] == "tester@example.com"
+
+    user_id = client.get("/users/me", headers=auth_headers).json()["id"]
+    assert client.delete(f"/users/{user_id}", headers=auth_headers).status_code == 204
+    assert client.get("/users/me", headers=auth_headers).status_code == 401
+
+
+def test_logout_revokes_the_token_at_once(client, auth_headers):
+    assert client.get("/users/me", headers=auth_headers).status_code == 200
+    assert client.post("/users/logout", headers=auth_headers).status_code == 200
+    refused = client.get("/users/me", headers=auth_headers)
+    assert refused.status_code == 401
+
+
+def test_revocation_cache_expiry_and_bloom_rebuild(monkeypatch):
+    import time
+
+    from app.core.revocation import RevocationCache
+
+    cache = RevocationCache(use_bloom=True)
+    now = time.time()
+    cache.add("gone", now - 1)  # already expired: never stored
+    for n in range(4):
+        cache.add(f"old-{n}", now + 10)
+    cache.add("live", now + 100)
+    cache.add("live", now + 100)  # re-read by a sync window: not stored twice
+    assert len(cache) == 5 and len(cache._heap) == 5
+    assert cache.contains("live") and cache.contains("old-0") and not cache.contains("gone")
+    assert not cache.contains("never-revoked")
+
+    monkeypatch.setattr("app.core.revocation.time.time", lambda: now + 11)
+    assert not cache.contains("old-0")
+    assert len(cache) == 1 and cache._bloom_items == 1  # filter rebuilt without the expired keys
+    assert cache.contains("live")
+
+
+def test_revocation_sync_sees_ids_committed_out_of_order(client, auth_headers, db):
+    import asyncio
+    from datetime import datetime, timedelta, timezone
+
+    from app.core.dependencies import db_session_scope
+    from app.core.revocation import RevocationCache
+    from app.models.user import RevokedToken
+
+    user_id = client.get("/users/me", headers=auth_headers).json()["id"]
+    now = datetime.now(tz=timezone.utc)
+
+    def revoke(row_id, jti, revoked_at):
+        db.add(RevokedToken(id=row_id, jti=jti, user_id=user_id, revoked_at=revoked_at,
+                            expires_at=now + timedelta(minutes=30)))
+        db.commit()
+
+    async def load(cache):
+        async with db_session_scope() as session:
+            return await cache.load(session)
+
+    cache = RevocationCache(sync_seconds=5, sync_slack=60)
+    revoke(11, "b", now)
+    asyncio.run(load(cache))
+    assert cache.contains("b")
+
+    # Logout A got id 10 first but commits after B was read
+    revoke(10, "a", now - timedelta(seconds=2))
+    asyncio.run(load(cache))
+    assert cache.contains("a") and len(cache) == 2
+
+    # The window is bounded: rows revoked well before the previous load are not re-read
+    revoke(9, "old", now - timedelta(minutes=10))
+    assert asyncio.run(load(cache)) == 2 and not cache.contains("old")
+
+
+def test_revocation_sync_is_single_flight():
+    import asyncio
+
+    from app.core.revocation import RevocationCache
+
+    cache = RevocationCache(sync_seconds=5)
+    queries, release = [], asyncio.Event()
+
+    class SlowDB:
+        async def execute(self, stmt):
+            queries.append(stmt)
+            await release.wait()
+            return type("Result", (), {"all": lambda self: []})()
+
+    async def scenario():
+        waiting = [asyncio.create_task(cache.sync(SlowDB())) for _ in range(20)]
+        await asyncio.sleep(0.01)
+        assert all(task.done() for task in waiting[1:])  # didn't wait for the query
+        release.set()
+        await asyncio.gather(*waiting)
+        assert len(queries) == 1
+        await cache.sync(SlowDB())  # fresh for another sync_seconds
+        assert len(queries) == 1
+
+    asyncio.run(scenario())
+
+
+def test_password_pool_sheds_past_workers_plus_queue():
+    import asyncio
+    import threading
+
+    from fastapi import HTTPException
+
+    from app.core import password_pool as pool_module
+    from app.core.password_pool import PasswordPool
+
+    pool = PasswordPool(workers=2, max_queue=1)
+    gate = threading.Event()
+
+    def verify_password(plain, hashed):
+        gate.wait(5)
+        return plain == hashed
+
+    waits_before = pool_module.queue_wait.count("verify_password")
+    rejected_before = pool_module.rejected.value("verify_password")
+
+    async def scenario():
+        held = [asyncio.create_task(pool.run(verify_password, "pw", "pw")) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert pool.pending == 3  # 2 running, 1 queued
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(verify_password, "pw", "pw")
+        assert (exc.value.status_code, exc.value.headers) == (503, {"Retry-After": "1"})
+        gate.set()
+        assert await asyncio.gather(*held) == [True, True, True]
+        assert pool.pending == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        gate.set()
+        pool.shutdown()
+    assert pool_module.rejected.value("verify_password") == rejected_before + 1
+    assert pool_module.queue_wait.count("verify_password") == waits_before + 3
+    # The queued job waited for a worker to come free
+    assert pool_module.queue_wait.sum("verify_password") > 0
+
+
+def test_login_latency_and_shedding_show_on_metrics(client, auth_headers):
+    from app.core.password_pool import password_pool
+    from tests.test_metrics import sample
+
+    credentials = {"username": "tester", "password": "secret123"}
+    login = 'http_request_duration_seconds_count{method="POST",route="/users/login",status="%s"}'
+    before = client.get("/metrics").text
+    assert client.post("/users/login", data=credentials).status_code == 200
+
+    password_pool.pending = password_pool.workers + password_pool.max_queue  # as if all were busy
+    try:
+        shed = client.post("/users/login", data=credentials)
+    finally:
+        password_pool.pending = 0
+    assert (shed.status_code, shed.headers["Retry-After"]) == (503, "1")
+
+    after = client.get("/metrics").text
+    for line in (
+        login % 200,
+        login % 503,
+        'login_duration_seconds_count{outcome="success"}',
+        'login_duration_seconds_count{outcome="shed"}',
+        'password_hash_duration_seconds_count{op="verify_password"}',
+        'password_hash_queue_wait_seconds_count{op="verify_password"}',
+        'password_hash_rejected_total{op="verify_password"}',
+    ):
+        assert sample(after, line) == sample(before, line) + 1, line
+
+
+def test_token_sweeper_deletes_expired_rows_in_bounded_batches(client, auth_headers, db, max_queries):
+    import asyncio
+    from datetime import datetime, timedelta, timezone
+
+    from app.core.dependencies import db_session_scope
+    from app.core.token_sweeper import sweep_expired_tokens
+    from app.models.user import RevokedToken
+
+    user_id = client.get("/users/me", headers=auth_headers).json()["id"]
+    now = datetime.now(tz=timezone.utc)
+    db.add_all(
+        RevokedToken(jti=f"{kind}-{n}", user_id=user_id, expires_at=now + offset)
+        for kind, offset, count in (("expired", -timedelta(minutes=5), 5), ("live", timedelta(minutes=5), 2))
+        for n in range(count)
+    )
+    db.commit()
+
+    async def sweep():
+        async with db_session_scope() as session:
+            return await sweep_expired_tokens(session, batch_size=2)
+
+    with max_queries(10) as statements:
+        deleted, elapsed = asyncio.run(sweep())
+    assert deleted == 5 and elapsed >= 0
+    deletes = [n for statement, n in statements.items() if statement.lstrip().upper().startswith("DELETE")]
+    assert sum(deletes) == 3  # 2 + 2 + 1
+    db.expire_all()
+    assert sorted(db.scalars(select(RevokedToken.jti))) == ["live-0", "live-1"]
+
+
+def test_password_process_pool_does_not_fork_the_server():
+    import asyncio
+
+    from app.core.password_pool import PasswordPool
+    from app.core.security import get_password_hash, verify_password
+
+    pool = PasswordPool(workers=1, max_queue=1, use_processes=True)
+    try:
+        assert pool.executor._mp_context.get_start_method() in ("forkserver", "spawn")
+        hashed = asyncio.run(pool.run(get_password_hash, "secret123"))
+        assert asyncio.run(pool.run(verify_password, "secret123", hashed)) is True
+    finally:
+        pool.shutdown()